@@ -28,6 +28,9 @@ import urllib.error
 import socket
 import threading
 import collections
+import itertools
+import bisect
+import weakref
 import sys
 import signal
 import re
@@ -47,14 +50,123 @@ signal.signal(signal.SIGINT, signal.SIG_DFL)  # allow using ctrl-c to terminate
 FALLBACK_COVER=Gdk.Paintable.new_empty(1, 1)
 CONNECTION_TIMEOUT=30
 MINIMUM_MPD_VERSION="0.24.0"
+UNKNOWN_ARTIST_MARKUP=f'<i>{GLib.markup_escape_text(_("Unknown Artist"))}</i>'
+UNKNOWN_ALBUM_MARKUP=f'<i>{GLib.markup_escape_text(_("Unknown Album"))}</i>'
 
 def idle_add(*args, **kwargs):
 	GLib.idle_add(*args, priority=GLib.PRIORITY_DEFAULT, **kwargs)
 
+def get_ranges(positions):
+	ranges=[]
+	for position in sorted(set(positions)):
+		if ranges and ranges[-1][1] == position:
+			ranges[-1][1]+=1
+		else:
+			ranges.append([position, position+1])
+	return ranges
+
 def lookup_icon(icon_name, size, scale=1):
 	return Gtk.IconTheme.get_for_display(Gdk.Display.get_default()).lookup_icon(
 			icon_name, None, size, scale, Gtk.TextDirection.NONE, Gtk.IconLookupFlags.FORCE_REGULAR)
 
+class FrameScheduler():
+	"""
+	Runs queued main thread work in slices of at most a few milliseconds per frame of the attached widget.
+	Jobs are called again as long as they return True, jobs with a higher priority (lower value) run first.
+	While the widget is not mapped, an idle callback with the same budget takes over.
+	Mapped windows which are minimized or occluded may get no frames, a timeout runs the jobs if frames stop arriving.
+	Jobs raising an exception are dropped without stopping the others.
+	"""
+	_BUDGET=4000  # microseconds
+	_FALLBACK_INTERVAL=100  # milliseconds without frames
+	def __init__(self):
+		self._widget=None
+		self._jobs=[]  # sorted [priority, serial, callback, args]
+		self._serial=itertools.count()
+		self._tick=None
+		self._fallback=None
+		self._idle=None
+		self._last_run=0
+
+	def attach(self, widget):
+		self._widget=widget
+		widget.connect("map", self._on_mapped_changed)
+		widget.connect("unmap", self._on_mapped_changed)
+		self._wakeup()
+
+	def add(self, callback, *args, priority=GLib.PRIORITY_DEFAULT_IDLE):
+		job=[priority, next(self._serial), callback, args]
+		bisect.insort(self._jobs, job, key=lambda job: job[:2])
+		self._wakeup()
+		return job
+
+	def remove(self, job):
+		for i, queued in enumerate(self._jobs):
+			if queued is job:
+				del self._jobs[i]
+				break
+
+	def _wakeup(self):
+		if not self._jobs:
+			return
+		if self._widget is not None and self._widget.get_mapped():
+			if self._tick is None:
+				self._last_run=GLib.get_monotonic_time()
+				self._tick=self._widget.add_tick_callback(self._on_tick)
+				self._fallback=GLib.timeout_add(self._FALLBACK_INTERVAL, self._on_fallback)
+		elif self._idle is None:
+			self._idle=GLib.idle_add(self._on_idle, priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+	def _run(self):
+		self._last_run=GLib.get_monotonic_time()
+		deadline=self._last_run+self._BUDGET
+		while self._jobs and GLib.get_monotonic_time() < deadline:
+			job=self._jobs[0]
+			try:
+				if not job[2](*job[3]):
+					self.remove(job)
+			except Exception:  # a failing job is dropped, the sources stay alive for the others
+				self.remove(job)
+				sys.excepthook(*sys.exc_info())
+		return bool(self._jobs)
+
+	def _stop_ticking(self):
+		if self._tick is not None:
+			self._widget.remove_tick_callback(self._tick)
+			self._tick=None
+		if self._fallback is not None:
+			GLib.source_remove(self._fallback)
+			self._fallback=None
+
+	def _on_tick(self, widget, frame_clock):
+		if self._run():
+			return True
+		self._tick=None
+		self._stop_ticking()
+		return False
+
+	def _on_fallback(self):
+		if GLib.get_monotonic_time()-self._last_run < self._FALLBACK_INTERVAL*1000 or self._run():
+			return True
+		self._fallback=None
+		self._stop_ticking()
+		return False
+
+	def _on_idle(self):
+		if self._run():
+			return True
+		self._idle=None
+		return False
+
+	def _on_mapped_changed(self, widget):
+		self._stop_ticking()
+		if self._idle is not None:
+			GLib.source_remove(self._idle)
+			self._idle=None
+		self._wakeup()
+
+SCHEDULER=FrameScheduler()
+
 #########
 # MPRIS #
 #########
@@ -340,6 +452,114 @@ class SearchFilter():
 	def _escape(self, keyword):
 		return keyword.replace("\\", "\\\\\\\\").replace("'", "\\\\'").replace("\"", "\\\\\\\"")
 
+class LRUCache():
+	def __init__(self, size):
+		self._size=size
+		self._data=collections.OrderedDict()
+
+	def __contains__(self, key):
+		return key in self._data
+
+	def get(self, key, default=None):
+		if key not in self._data:
+			return default
+		self._data.move_to_end(key)
+		return self._data[key]
+
+	def put(self, key, value):
+		self._data[key]=value
+		self._data.move_to_end(key)
+		if len(self._data) > self._size:
+			self._data.popitem(last=False)
+
+	def items(self):
+		return self._data.items()
+
+	def pop(self, key, default=None):
+		return self._data.pop(key, default)
+
+	def clear(self):
+		self._data.clear()
+
+class SearchCache(LRUCache):
+	"""
+	Results of a query are a subset of the results of every query whose keywords are all contained in its keywords.
+	Complete result sets are therefore refined locally while the user extends a query.
+	Result sets above the limit are cut off and count as complete for their own query, but are never refined.
+	"""
+	def __init__(self, size=32, max_results=5000):
+		super().__init__(size)
+		self._max_results=max_results
+
+	def _normalize(self, keywords):
+		return frozenset(keyword.casefold() for keyword in keywords)
+
+	def _refine(self, kind, keywords, values):
+		broader=None
+		for (cached_kind, cached_keywords), (results, complete, truncated) in self.items():
+			if cached_kind == kind and complete and not truncated and all(any(cached in keyword for keyword in keywords) for cached in cached_keywords):
+				if broader is None or len(results) < len(broader):
+					broader=results
+		if broader is not None:
+			return [item for item in broader if all(any(keyword in value.casefold() for value in values(item)) for keyword in keywords)]
+
+	def lookup(self, kind, keywords, values):
+		keywords=self._normalize(keywords)
+		if (entry:=self.get((kind, keywords))) is not None:
+			return entry[:2]
+		if (results:=self._refine(kind, keywords, values)) is not None:
+			self.put((kind, keywords), (results, True, False))
+			return (results, True)
+		return ([], False)
+
+	def store(self, kind, keywords, results, complete):
+		if (truncated:=len(results) > self._max_results):
+			results=results[:self._max_results]
+			complete=True
+		self.put((kind, self._normalize(keywords)), (results, complete, truncated))
+
+class FenwickTree():
+	"""
+	Binary indexed tree over a list of numbers with logarithmic updates and prefix sums.
+	"""
+	def __init__(self, values=()):
+		self._values=list(values)
+		self._tree=[0.0, *self._values]
+		for i in range(1, len(self._tree)):
+			if (parent:=i+(i&-i)) < len(self._tree):
+				self._tree[parent]+=self._tree[i]
+
+	def __len__(self):
+		return len(self._values)
+
+	def set(self, index, value):
+		delta=value-self._values[index]
+		self._values[index]=value
+		i=index+1
+		while i < len(self._tree):
+			self._tree[i]+=delta
+			i+=i&-i
+
+	def append(self, value):
+		i=len(self._tree)
+		self._values.append(value)
+		self._tree.append(value+self.prefix_sum(i-1)-self.prefix_sum(i-(i&-i)))
+
+	def truncate(self, length):
+		# nodes only cover values up to their own index, so the remaining ones stay valid
+		del self._values[length:]
+		del self._tree[length+1:]
+
+	def prefix_sum(self, index):
+		total=0.0
+		while index > 0:
+			total+=self._tree[index]
+			index-=index&-index
+		return total
+
+	def total(self):
+		return self.prefix_sum(len(self._values))
+
 class TagFilter():
 	def __init__(self, **kwargs):
 		self.filter=kwargs
@@ -383,10 +603,14 @@ class MultiTag(list):
 
 class SongMetaclass(type(GObject.Object), type(collections.UserDict)): pass
 class Song(collections.UserDict, GObject.Object, metaclass=SongMetaclass):
+	__gtype_name__="Song"
 	def __init__(self):
 		collections.UserDict.__init__(self)
 		GObject.Object.__init__(self)
+		self._display={}  # formatted row texts by hidden artist
 	def __setitem__(self, key, value):
+		if key not in ("pos", "id"):
+			self._display.clear()
 		if key == "duration":
 			super().__setitem__(key, Duration(value))
 		elif key in ("file", "pos", "id"):
@@ -410,6 +634,22 @@ class Song(collections.UserDict, GObject.Object, metaclass=SongMetaclass):
 			elif key in ("track", "artist", "album", "date"):
 				return MultiTag([""])
 
+	def get_display(self, hide_artist=""):
+		if (display:=self._display.get(hide_artist)) is None:
+			subtitle=", ".join(artist for artist in self["artist"] if artist != hide_artist)
+			display=self._display[hide_artist]=(self["track"][0], self["title"][0], subtitle, str(self["duration"]))
+		return display
+
+	# properties for the labels of list item templates
+	@GObject.Property(type=str, flags=GObject.ParamFlags.READABLE)
+	def title(self): return self.get_display()[1]
+	@GObject.Property(type=str, flags=GObject.ParamFlags.READABLE)
+	def subtitle(self): return self.get_display()[2]
+	@GObject.Property(type=bool, default=False, flags=GObject.ParamFlags.READABLE)
+	def has_subtitle(self): return bool(self.get_display()[2])
+	@GObject.Property(type=str, flags=GObject.ParamFlags.READABLE)
+	def length(self): return self.get_display()[3]
+
 	def get_album_artist(self):
 		return Artist(self["albumartist"][0], self["albumartistsort"][0])
 
@@ -426,15 +666,32 @@ class Album(GObject.Object):
 		self.name=name
 		self.date=date
 		self.cover=None
+		self._alternative_text=None
+
+	def get_alternative_text(self):
+		if self._alternative_text is None:
+			if self.name:
+				self._alternative_text=_("Album cover of {album}").format(album=self.name)
+			else:
+				self._alternative_text=_("Album cover of an unknown album")
+		return self._alternative_text
 
 	def tag_filter(self):
 		return self.artist.tag_filter()+TagFilter(album=self.name, date=self.date)
 
 class Artist(GObject.Object):
+	__gtype_name__="Artist"
 	def __init__(self, name, sortname):
 		GObject.Object.__init__(self)
 		self.name=name
 		self.sortname=sortname
+		self._markup=None
+
+	@GObject.Property(type=str, flags=GObject.ParamFlags.READABLE)
+	def markup(self):
+		if self._markup is None:
+			self._markup=GLib.markup_escape_text(self.name) if self.name else UNKNOWN_ARTIST_MARKUP
+		return self._markup
 
 	def __eq__(self, other):
 		return (self.name == other.name) and (self.sortname == other.sortname)
@@ -442,6 +699,468 @@ class Artist(GObject.Object):
 	def tag_filter(self):
 		return TagFilter(albumartist=self.name, albumartistsort=self.sortname)
 
+class Directory(GObject.Object):
+	def __init__(self, path):
+		GObject.Object.__init__(self)
+		self.path=path
+		self.name=GLib.path_get_basename(path)
+
+	def get_quoted_path(self):
+		return f'"{self.path.replace("\"", "\\\"")}"'
+
+class FacetIndex():
+	"""
+	Inverted index from tag values to albums.
+	Filters are sequences of (facet, value) pairs, album counts and matches are cached per combination of filters.
+	"""
+	FACETS=("genre", "composer", "decade", "year")
+	def __init__(self, rows):
+		self._albums=[]
+		self._index={facet: collections.defaultdict(set) for facet in self.FACETS}
+		self._cache=LRUCache(64)
+		album_ids={}
+		for name, albumartist, albumartistsort, date, genre, composer in rows:
+			if (album_id:=album_ids.get(key:=(name, albumartist, albumartistsort, date))) is None:
+				album_id=album_ids[key]=len(self._albums)
+				self._albums.append(key)
+				if (year:=date[:4]).isdigit():
+					self._index["year"][year].add(album_id)
+					self._index["decade"][f"{year[:3]}0s"].add(album_id)
+			if genre:
+				self._index["genre"][genre].add(album_id)
+			if composer:
+				self._index["composer"][composer].add(album_id)
+
+	def _match(self, filters):
+		if (album_ids:=self._cache.get(("match", filters))) is None:
+			album_ids=set.intersection(*(self._index[facet].get(value, set()) for facet, value in filters))
+			self._cache.put(("match", filters), album_ids)
+		return album_ids
+
+	def get_counts(self, facet, filters):
+		filters=tuple(sorted(filters))
+		if (counts:=self._cache.get((facet, filters))) is None:
+			if filters:
+				album_ids=self._match(filters)
+				counts=[(value, n) for value, albums in self._index[facet].items() if (n:=len(albums&album_ids))]
+			else:
+				counts=[(value, len(albums)) for value, albums in self._index[facet].items()]
+			counts.sort(key=lambda item: locale.strxfrm(item[0]))
+			self._cache.put((facet, filters), counts)
+		return counts
+
+	def get_albums(self, filters):
+		if filters:
+			return [self._albums[album_id] for album_id in self._match(tuple(sorted(filters)))]
+		return list(self._albums)
+
+class ResponseStream():
+	"""
+	Incrementally parsed response of a command.
+	The client drains the rest of the response into the buffer before it sends the next command.
+	"""
+	def __init__(self, iterator):
+		self._iterator=iterator
+		self._buffer=collections.deque()
+		self._finished=False
+		self._cancelled=False
+
+	@property
+	def done(self):
+		return self._cancelled or (self._finished and not self._buffer)
+
+	@property
+	def cancelled(self):
+		return self._cancelled
+
+	def read(self, num):
+		if self._cancelled:
+			return []
+		items=[self._buffer.popleft() for i in range(min(num, len(self._buffer)))]
+		if not self._finished and len(items) < num:
+			items.extend(itertools.islice(self._iterator, num-len(items)))
+			self._finished=len(items) < num
+		return items
+
+	def drain(self):
+		if not self._finished:
+			if self._cancelled:
+				collections.deque(self._iterator, maxlen=0)
+			else:
+				self._buffer.extend(self._iterator)
+			self._finished=True
+
+	def cancel(self):
+		self._cancelled=True
+		self._buffer.clear()
+
+class AlbumPrefetcher():
+	"""
+	Loads album covers and contents into the cache of the client in the background.
+	Requests run one at a time at low priority and wait for pending responses of the client, covers are loaded before contents.
+	Content requests are delayed and can be tagged with an owner to cancel them together.
+	"""
+	def __init__(self, client, limit=4, delay=150):
+		self._client=client
+		self._delay=delay
+		self._timeouts={}  # album: (source, owner)
+		self._queue=collections.deque(maxlen=limit)  # oldest requests are dropped first
+		self._covers={}  # album: callback
+		self._source=None
+
+	def add(self, album, delay=None, owner=None):
+		self.cancel(album)
+		source=GLib.timeout_add(self._delay if delay is None else delay, self._on_timeout, album, owner)
+		self._timeouts[album]=(source, owner)
+
+	def cancel(self, album):
+		if (timeout:=self._timeouts.pop(album, None)) is not None:
+			GLib.source_remove(timeout[0])
+		else:
+			self._remove_queued(lambda queued_album, owner: queued_album is album)
+
+	def load_cover(self, album, callback):
+		self._covers[album]=callback
+		self._schedule()
+
+	def cancel_cover(self, album):
+		self._covers.pop(album, None)
+
+	def cancel_all(self, owner=None):
+		for album, (source, album_owner) in list(self._timeouts.items()):
+			if owner is None or album_owner is owner:
+				GLib.source_remove(source)
+				del self._timeouts[album]
+		self._remove_queued(lambda album, album_owner: owner is None or album_owner is owner)
+		if owner is None:
+			self._covers.clear()
+			if self._source is not None:
+				GLib.source_remove(self._source)
+				self._source=None
+
+	def _remove_queued(self, condition):
+		remaining=[request for request in self._queue if not condition(*request)]
+		self._queue.clear()
+		self._queue.extend(remaining)
+
+	def _schedule(self):
+		if self._source is None and (self._covers or self._queue):
+			if self._client.is_streaming():
+				self._source=GLib.timeout_add(100, self._run, priority=GLib.PRIORITY_LOW)
+			else:
+				self._source=GLib.idle_add(self._run, priority=GLib.PRIORITY_LOW)
+
+	def _on_timeout(self, album, owner):
+		del self._timeouts[album]
+		self._queue.append((album, owner))
+		self._schedule()
+		return False
+
+	def _run(self):
+		self._source=None
+		if not self._client.is_streaming():
+			try:
+				if self._covers:
+					album=next(iter(self._covers))
+					callback=self._covers.pop(album)
+					if album.cover is None:
+						album.cover=self._client.get_cover(album)
+					callback(album)
+				elif self._queue:
+					self._client.get_album_contents(self._queue.popleft()[0])
+			except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+				self._client.close_connection()
+				return False
+			except ValueError:  # Connection closed by user
+				return False
+		self._schedule()
+		return False
+
+class QueueTracker(GObject.Object):
+	"""
+	Keeps the durations of the songs in the queue in a Fenwick tree, so the remaining time from any position is a logarithmic lookup.
+	A search key per song allows finding songs in the queue without asking the server, the keys are only loaded once a search needs them.
+	The initial queue is streamed once without tags, later changes are applied from the changed positions and ids.
+	"""
+	__gsignals__={"changed": (GObject.SignalFlags.RUN_FIRST, None, ())}
+	_CHUNK_SIZE=250
+	def __init__(self, client):
+		super().__init__()
+		self._client=client
+		self._version=None
+		self._ids=[]
+		self._durations={}  # by song id
+		self._keys={}  # by song id
+		self._indexed=False
+		self._tree=None
+		self._matches=None  # last query and its matching positions
+		self._stream=None
+		self._loader=None
+		self._key_stream=None
+		self._key_loader=None
+
+		# connect
+		client.connect("playlist", self._on_playlist_changed)
+		client.connect("disconnected", self._on_disconnected)
+
+	def get_remaining(self, position, elapsed=0.0):
+		if self._tree is not None and position < len(self._tree):
+			return max(0.0, self._tree.total()-self._tree.prefix_sum(position)-elapsed)
+
+	def index(self):
+		if self._tree is not None and not self._indexed and self._key_loader is None:
+			self._key_loader=SCHEDULER.add(self._load_keys)
+
+	def find(self, query):
+		if self._tree is None or not self._indexed:
+			return []
+		query=query.casefold()
+		words=query.split()
+		# a query extending the last one can only match a subset of its positions
+		if self._matches is not None and query.startswith(self._matches[0]):
+			candidates=self._matches[1]
+		else:
+			candidates=range(len(self._ids))
+		matches=[position for position in candidates if all(word in self._keys.get(self._ids[position], "") for word in words)]
+		self._matches=(query, matches)
+		return matches
+
+	def _add_duration(self, song):
+		self._durations[song["id"]]=float(song["duration"]) if "duration" in song else 0.0
+
+	def _add_key(self, song):
+		self._keys[song["id"]]=f"{song['title']} {song['artist']}".casefold()
+
+	def _clear(self):
+		self._ids=[]
+		self._durations={}
+		self._keys={}
+		self._indexed=False
+		self._matches=None
+
+	def _cancel(self):
+		if self._loader is not None:
+			SCHEDULER.remove(self._loader)
+			self._loader=None
+		if self._stream is not None:
+			self._stream.cancel()
+			self._stream=None
+		if self._key_loader is not None:
+			SCHEDULER.remove(self._key_loader)
+			self._key_loader=None
+		if self._key_stream is not None:
+			self._key_stream.cancel()
+			self._key_stream=None
+
+	def _load_chunk(self):
+		try:
+			if self._stream is None:  # started here to let the views send their commands first
+				self._stream=self._client.stream_playlist("none")
+			for song in self._stream.read(self._CHUNK_SIZE):
+				self._ids.append(song["id"])
+				self._add_duration(song)
+		except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+			self._cancel()
+			self._client.close_connection()
+			return False
+		except ValueError:  # Connection closed by user
+			self._cancel()
+			return False
+		if self._stream.done:
+			if not self._stream.cancelled:
+				self._tree=FenwickTree(self._durations[songid] for songid in self._ids)
+				self.emit("changed")
+			self._stream=None
+			self._loader=None
+			return False
+		return True
+
+	def _load_keys(self):
+		try:
+			if self._key_stream is None:
+				self._key_stream=self._client.stream_playlist("playlist")
+			for song in self._key_stream.read(self._CHUNK_SIZE):
+				self._add_key(song)
+		except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+			self._cancel()
+			self._client.close_connection()
+			return False
+		except ValueError:  # Connection closed by user
+			self._cancel()
+			return False
+		if self._key_stream.done:
+			if not self._key_stream.cancelled:
+				self._indexed=True
+				self._matches=None
+				self.emit("changed")
+			self._key_stream=None
+			self._key_loader=None
+			return False
+		return True
+
+	def _reload(self):
+		self._cancel()
+		self._clear()
+		self._tree=None
+		self._loader=SCHEDULER.add(self._load_chunk)
+
+	def _update(self, changes, length):
+		# songs changed in place have new tags, e.g. the title of a stream
+		missing=[songid for position, songid in changes if songid not in self._durations or (position < len(self._ids) and self._ids[position] == songid)]
+		if len(missing) > self._CHUNK_SIZE:  # e.g. the whole library was added, streaming is cheaper than fetching each song
+			self._reload()
+			self.emit("changed")
+			return
+		if missing:
+			for song in self._client.get_playlist_songs(missing):
+				self._add_duration(song)
+				self._add_key(song)
+		for position, songid in sorted(changes):
+			duration=self._durations.setdefault(songid, 0.0)
+			self._keys.setdefault(songid, "")
+			if position < len(self._ids):
+				self._ids[position]=songid
+				self._tree.set(position, duration)
+			else:
+				self._ids.append(songid)
+				self._tree.append(duration)
+		del self._ids[length:]
+		self._tree.truncate(length)
+		if len(self._durations) > 2*length:  # forget removed songs
+			self._durations={songid: self._durations[songid] for songid in self._ids}
+			self._keys={songid: self._keys[songid] for songid in self._ids if songid in self._keys}
+		self._matches=None
+		self.emit("changed")
+
+	def _on_playlist_changed(self, client, version, length, songpos):
+		if self._tree is None:
+			self._reload()
+		else:
+			self._update(self._client.get_playlist_changes(self._version), length)
+		self._version=version
+
+	def _on_disconnected(self, *args):
+		self._cancel()
+		self._clear()
+		self._version=None
+		self._tree=None
+		self.emit("changed")
+
+class PlaybackClock():
+	"""
+	Extrapolates the elapsed time of the current song from the last known position.
+	Polled positions only reset the clock if they deviate from the prediction, which means the playback position jumped.
+	"""
+	_TOLERANCE=0.5  # seconds
+	def __init__(self):
+		self.reset()
+
+	def reset(self, elapsed=0.0, duration=0.0, playing=False):
+		self._elapsed=elapsed
+		self._duration=duration
+		self._playing=playing
+		self._timestamp=GLib.get_monotonic_time()
+
+	def get_elapsed(self):
+		elapsed=self._elapsed
+		if self._playing:
+			elapsed+=(GLib.get_monotonic_time()-self._timestamp)/1000000
+			if self._duration > 0:
+				elapsed=min(elapsed, self._duration)
+		return elapsed
+
+	def get_duration(self):
+		return self._duration
+
+	def at_end(self):
+		return self._duration > 0 and self.get_elapsed() >= self._duration-self._TOLERANCE
+
+	def sync(self, elapsed, duration, playing):
+		if playing == self._playing and duration == self._duration and abs(elapsed-self.get_elapsed()) <= self._TOLERANCE:
+			return False
+		self.reset(elapsed, duration, playing)
+		return True
+
+class PlayerState():
+	"""
+	Collects the status signals of the client and delivers the latest values to widgets once per frame.
+	Widgets only get the fields they subscribed to and only while they are mapped, missed changes are delivered when they get mapped.
+	Subscriptions without a widget are delivered on every frame with changes.
+	Animations get the extrapolated elapsed time on every frame of their widget while playing.
+	"""
+	_FIELDS=("elapsed", "bitrate", "volume", "state")
+	def __init__(self, client):
+		self._clock=client.clock
+		self._values={}  # field: (serial, signal arguments)
+		self._serial=itertools.count()
+		self._subscriptions=[]  # [widget, field, callback, last delivered serial]
+		self._animations=[]  # [widget, callback, tick callback id]
+		self._playing=False
+		self._flush=None
+
+		# connect
+		for field in self._FIELDS:
+			client.connect(field, self._on_changed, field)
+		client.connect("disconnected", self._on_disconnected)
+
+	def subscribe(self, widget, field, callback):
+		if widget is not None and not any(subscription[0] is widget for subscription in self._subscriptions):
+			widget.connect("map", self._on_map)
+		self._subscriptions.append([widget, field, callback, -1])
+
+	def animate(self, widget, callback):
+		animation=[widget, callback, None]
+		self._animations.append(animation)
+		self._run_animation(animation)
+
+	def _run_animation(self, animation):
+		widget,callback,tick=animation
+		if self._playing and tick is None:
+			def on_tick(widget, frame_clock):
+				callback(self._clock.get_elapsed(), self._clock.get_duration())
+				return True
+			animation[2]=widget.add_tick_callback(on_tick)  # only called while the widget is mapped
+		elif not self._playing and tick is not None:
+			widget.remove_tick_callback(tick)
+			animation[2]=None
+
+	def _deliver(self, subscriptions):
+		# in the order of the changes, e.g. a stop after the last elapsed time
+		pending=[]
+		for subscription in subscriptions:
+			if (value:=self._values.get(subscription[1])) is not None and value[0] > subscription[3]:
+				pending.append((value[0], subscription))
+		for serial, subscription in sorted(pending, key=lambda item: item[0]):
+			subscription[3]=serial
+			subscription[2](*self._values[subscription[1]][1])
+
+	def _on_changed(self, client, *args):
+		*args,field=args
+		self._values[field]=(next(self._serial), args)
+		if field == "state" and (playing:=args[0] == "play") != self._playing:
+			self._playing=playing
+			for animation in self._animations:
+				self._run_animation(animation)
+		if self._flush is None:
+			self._flush=SCHEDULER.add(self._on_flush, priority=GLib.PRIORITY_HIGH)
+
+	def _on_flush(self):
+		self._flush=None
+		self._deliver(subscription for subscription in self._subscriptions if subscription[0] is None or subscription[0].get_mapped())
+		return False
+
+	def _on_map(self, widget):
+		self._deliver(subscription for subscription in self._subscriptions if subscription[0] is widget)
+
+	def _on_disconnected(self, *args):
+		if self._flush is not None:
+			SCHEDULER.remove(self._flush)
+			self._flush=None
+		self._values.clear()
+		self._playing=False
+		for animation in self._animations:
+			self._run_animation(animation)
+
 class CommandError(Exception): pass
 class Client(GObject.Object):
 	__gsignals__={
@@ -464,13 +1183,47 @@ class Client(GObject.Object):
 		"show-album": (GObject.SignalFlags.RUN_FIRST, None, (Album,)),
 		"seeked": (GObject.SignalFlags.RUN_FIRST, None, (float,)),
 	}
+	_TAGTYPES={
+		"default": ("track", "title", "artist", "album", "albumartist", "albumartistsort", "date"),
+		"playlist": ("title", "artist"),
+		"none": (),
+	}
 	_COVER_REGEX=re.compile(r"^\.?(album|cover|folder|front).*\.(gif|jpeg|jpg|png)$", flags=re.IGNORECASE)
 	_SOCKET_PATH=GLib.build_filenamev([GLib.get_user_runtime_dir(), "mpd", "socket"])
 	_BUS=Gio.bus_get_sync(Gio.BusType.SESSION, None)  # used for "show in file manager"
+	_POLL_INTERVALS={("play", True): 1000, ("play", False): 2000, ("pause", True): 1000, ("pause", False): 5000, ("stop", True): 1000, ("stop", False): 5000}
+	_ACTIVE_INTERVAL=100  # milliseconds
+	_COMMAND_LIST_SIZE=1000
+	_ACTIVE_TIME=3000000  # microseconds of full rate polling after a command
 	def __init__(self, settings):
 		super().__init__()
 		self._settings=settings
 		self._cached_status={}
+		self._tagtypes=None
+		self._search_cache=SearchCache()
+		self._album_cache=LRUCache(16)
+		self._album_entries=None
+		self._facets=None
+		self._directory_cache=LRUCache(64)
+		self._stream=None
+		self.prefetcher=AlbumPrefetcher(self)
+		self.queue=QueueTracker(self)
+		self.clock=PlaybackClock()
+		self.player_state=PlayerState(self)
+		self._playlist_changes=(None, None, [])
+
+		# polling
+		self._poll=None  # (source, interval)
+		self._window_visible=True
+		self._active_until=0
+		self._power_profile_monitor=Gio.PowerProfileMonitor.dup_default()
+		self._network_monitor=Gio.NetworkMonitor.get_default()
+
+		# connect
+		self.connect("songid", self._on_songid)
+		self.connect("disconnected", lambda *args: self.prefetcher.cancel_all())
+		self._power_profile_monitor.connect("notify::power-saver-enabled", self._on_poll_conditions_changed)
+		self._network_monitor.connect("notify::network-metered", self._on_poll_conditions_changed)
 
 	def _post_connect(self):
 		self._socket.settimeout(None)
@@ -552,16 +1305,61 @@ class Client(GObject.Object):
 		if song:
 			yield song
 
+	def _parse_directory(self):
+		song=None
+		for key, value in self._parse_pairs():
+			if key in ("directory", "file", "playlist"):
+				if song is not None:
+					yield song
+				song=None
+				if key == "directory":
+					yield Directory(value)
+				elif key == "file":
+					song=Song()
+			if song is not None:
+				song[key]=value
+		if song is not None:
+			yield song
+
+	def _cache_directory(self, path, iterator):
+		listing=[]
+		for item in iterator:
+			listing.append(item)
+			yield item
+		self._directory_cache.put(path, listing)
+
 	def _parse_song(self):
 		song=Song()
 		for song in self._parse_songs():
 			continue
 		return song
 
+	def _start_stream(self, iterator):
+		self._stream=ResponseStream(iterator)
+		return self._stream
+
+	def is_streaming(self):
+		return self._stream is not None and not self._stream.cancelled
+
+	def _finish_stream(self):
+		if self._stream is not None:
+			stream=self._stream
+			self._stream=None
+			stream.drain()
+
 	def _send_command(self, command):
+		self._finish_stream()
 		self._write_file.write(command+"\n")
 		self._write_file.flush()
 
+	def _send_command_list(self, commands):
+		self._send_command("\n".join(("command_list_begin", *commands, "command_list_end")))
+
+	def _run_command_list(self, commands):
+		self._send_command_list(commands)
+		self._clear_response()
+		self._poke()
+
 	def _clear_response(self):
 		while self._parse_line() is not None:
 			continue
@@ -569,6 +1367,7 @@ class Client(GObject.Object):
 	def _run_command(self, command):
 		self._send_command(command)
 		self._clear_response()
+		self._poke()
 
 	def update(self):
 		self._send_command("update")
@@ -576,6 +1375,7 @@ class Client(GObject.Object):
 		# than around a tenth of a second and therefore can't be detected by _main_loop.
 		self._cached_status["updating_db"]=self._parse_dict()["updating_db"]
 		self.emit("updating-db")
+		self._poke()
 
 	def open_connection(self, manual):
 		def callback():
@@ -614,7 +1414,8 @@ class Client(GObject.Object):
 			# set password
 			if password:
 				try:
-					self._run_command(f"password {password}")
+					self._send_command(f"password {password}")
+					self._clear_response()
 				except CommandError:
 					self.close_connection()
 					self.emit("server-error", _("Incorrect password"))
@@ -632,10 +1433,11 @@ class Client(GObject.Object):
 				self.close_connection()
 				self.emit("server-error", _("Not enough permissions"))
 				return False
-			self._set_default_tagtypes()
+			self._tagtypes=None  # a new connection has all tags enabled
+			self._use_tagtypes("default")
 			self._settings.set_boolean("manual-connection", manual)
 			self.emit("connected", self._database_is_empty())
-			GLib.timeout_add(100, self._main_loop)
+			self._schedule_poll()
 			return False
 		GLib.idle_add(callback)
 
@@ -646,19 +1448,25 @@ class Client(GObject.Object):
 			self._write_file.close()
 		except BrokenPipeError:
 			pass
+		if self._poll is not None:
+			GLib.source_remove(self._poll[0])
+			self._poll=None
 		self._cached_status={}
+		self.clock.reset()
+		self._clear_caches()
+		if self._stream is not None:
+			self._stream.cancel()
+			self._stream=None
 		self.emit("disconnected")
 
 	def connected(self):
 		try:
-			self._run_command("ping")
+			self._send_command("ping")
+			self._clear_response()
 			return True
 		except:
 			return False
 
-	def delete_song(self, song):
-		self._run_command(f'deleteid {song["id"]}')
-
 	def add_song(self, song, position):
 		self._run_command(f"add {song.get_quoted_file()} {position}")
 
@@ -670,11 +1478,36 @@ class Client(GObject.Object):
 		self.append_song(song)
 		self.play()
 
-	def as_next_song(self, song):
+	def delete_positions(self, positions):
+		# contiguous positions are deleted as ranges, starting from the end to keep the positions of the others valid
+		self._run_command_list(f"delete {start}:{end}" for start, end in reversed(get_ranges(positions)))
+
+	def move_positions(self, positions, to):
+		# gather the ranges behind the first one, then move the whole block, none of these moves shifts a range not moved yet
+		if not (ranges:=get_ranges(positions)):
+			return
+		start,end=ranges[0]
+		commands=[]
+		for range_start, range_end in ranges[1:]:
+			commands.append(f"move {range_start}:{range_end} {end}")
+			end+=range_end-range_start
+		# the cached length can be older than the positions, e.g. after songs were added from another client
+		to=max(0, min(to, int(self.status()["playlistlength"])-(end-start)))
+		if start != to:
+			commands.append(f"move {start}:{end} {to}")
+		self._run_command_list(commands)
+
+	def add_songs(self, songs, position):
+		self._run_command_list(f"add {song.get_quoted_file()} {position+i}" for i, song in enumerate(songs))
+
+	def append_songs(self, songs):
+		self._run_command_list(f"add {song.get_quoted_file()}" for song in songs)
+
+	def as_next_songs(self, songs):
 		try:
-			self.add_song(song, "+0")
+			self._run_command_list(f"add {song.get_quoted_file()} +{i}" for i, song in enumerate(songs))
 		except CommandError:
-			self.add_song(song, "0")
+			self.add_songs(songs, 0)
 
 	def append_album(self, album):
 		self._run_command(f"findadd {album.tag_filter()}")
@@ -691,6 +1524,7 @@ class Client(GObject.Object):
 		if self.get_playlistlength() > 1:
 			self._run_command("delete 1:")
 		self.append_album(song.get_album())
+		self._use_tagtypes("none")
 		self._send_command(f"playlistfind file {song.get_quoted_file()}")
 		if duplicate:=self._parse_song():
 			self._run_command(f'swapid {songid} {duplicate["id"]}')
@@ -704,14 +1538,18 @@ class Client(GObject.Object):
 			if self.get_playlistlength() > 1:
 				self._run_command("delete 1:")
 
-	def search_songs(self, keywords, num):
+	def search_songs(self, keywords, start, end):
 		tags=("title", "artist", "album", "date")
-		self._send_command(f"search {SearchFilter(tags, keywords)} window 0:{num}")
-		return self._parse_songs()
-
-	def search_albums(self, keywords, num):
-		tags=("album", "albumartist", "albumartistsort", "date")
-		self._send_command(f"list album {SearchFilter(tags, keywords)} group date group albumartist group albumartistsort")
+		values=lambda song: (value for tag in tags for value in song.data.get(tag, ()))
+		songs,complete=self._search_cache.lookup("songs", keywords, values)
+		if not complete and len(songs) < end:
+			self._use_tagtypes("default")
+			self._send_command(f"search {SearchFilter(tags, keywords)} window {len(songs)}:{end}")
+			songs=songs+list(self._parse_songs())
+			self._search_cache.store("songs", keywords, songs, len(songs) < end)
+		return songs[start:end]
+
+	def _parse_album_entries(self):
 		for key, value in self._parse_pairs():
 			if key == "date":
 				date=value
@@ -719,58 +1557,152 @@ class Client(GObject.Object):
 				albumartist=value
 			elif key == "albumartistsort":
 				albumartistsort=value
-			elif num > 0:
-				yield Album(Artist(albumartist, albumartistsort), value, date)
-				num-=1
+			else:
+				yield (value, albumartist, albumartistsort, date)
 
-	def search_artists(self, keywords, num):
+	def search_albums(self, keywords, start, end):
+		tags=("album", "albumartist", "albumartistsort", "date")
+		albums,complete=self._search_cache.lookup("albums", keywords, lambda album: album)
+		if not complete:
+			self._send_command(f"list album {SearchFilter(tags, keywords)} group date group albumartist group albumartistsort")
+			albums=list(self._parse_album_entries())
+			self._search_cache.store("albums", keywords, albums, True)
+		return [Album(Artist(albumartist, albumartistsort), name, date) for name, albumartist, albumartistsort, date in albums[start:end]]
+
+	def search_artists(self, keywords, start, end):
 		tags=("albumartist", "albumartistsort")
-		self._send_command(f"list albumartist {SearchFilter(tags, keywords)} group albumartistsort")
-		for key, value in self._parse_pairs():
-			if key == "albumartistsort":
-				sortname=value
-			elif num > 0:
-				yield Artist(value, sortname)
-				num-=1
+		artists,complete=self._search_cache.lookup("artists", keywords, lambda artist: artist)
+		if not complete:
+			self._send_command(f"list albumartist {SearchFilter(tags, keywords)} group albumartistsort")
+			artists=[]
+			for key, value in self._parse_pairs():
+				if key == "albumartistsort":
+					sortname=value
+				else:
+					artists.append((value, sortname))
+			self._search_cache.store("artists", keywords, artists, True)
+		return [Artist(name, sortname) for name, sortname in artists[start:end]]
 
 	def get_songs(self, album):
+		self._use_tagtypes("default")
 		self._send_command(f"find {album.tag_filter()}")
 		return self._parse_songs()
 
-	def get_albums(self, artist):
-		self._send_command(f"list album {artist.tag_filter()} group date")
+	def _parse_albums(self, artist):
 		for key, value in self._parse_pairs():
 			if key == "date":
 				date=value
 			else:
 				yield Album(artist, value, date)
 
-	def get_artists(self):
-		self._send_command(f"list albumartist group albumartistsort")
+	def get_albums(self, artist):
+		self._send_command(f"list album {artist.tag_filter()} group date")
+		return self._start_stream(self._parse_albums(artist))
+
+	def _parse_artists(self):
 		for key, value in self._parse_pairs():
 			if key == "albumartistsort":
 				sortname=value
 			else:
 				yield Artist(value, sortname)
 
+	def get_album_entries(self):
+		# mpd can't window "list" responses, so the plain tag tuples of all albums are fetched once per database
+		if self._album_entries is None:
+			self._send_command("list album group date group albumartist group albumartistsort")
+			self._album_entries=list(self._parse_album_entries())
+		return self._album_entries
+
+	def list_directory(self, directory):
+		if (listing:=self._directory_cache.get(directory.path)) is not None:
+			return ResponseStream(iter(listing))
+		self._use_tagtypes("none")  # only file names are shown
+		self._send_command(f"lsinfo {directory.get_quoted_path()}")
+		return self._start_stream(self._cache_directory(directory.path, self._parse_directory()))
+
+	def append_directory(self, directory):
+		self._run_command(f"add {directory.get_quoted_path()}")
+
+	def play_directory(self, directory):
+		self.clear()
+		self.append_directory(directory)
+		self.play()
+
+	def get_facets(self):
+		# one grouped query per database, all counts and filters are computed from the index
+		if self._facets is None:
+			self._send_command("list album group date group albumartist group albumartistsort group genre group composer")
+			row=dict.fromkeys(("date", "albumartist", "albumartistsort", "genre", "composer"), "")
+			rows=[]
+			for key, value in self._parse_pairs():
+				if key == "album":
+					rows.append((value, row["albumartist"], row["albumartistsort"], row["date"], row["genre"], row["composer"]))
+				else:
+					row[key]=value
+			self._facets=FacetIndex(rows)
+		return self._facets
+
+	def get_artists(self):
+		self._send_command(f"list albumartist group albumartistsort")
+		yield from self._parse_artists()
+
+	def stream_artists(self):
+		self._send_command("list albumartist group albumartistsort")
+		return self._start_stream(self._parse_artists())
+
 	def get_cover(self, album):
-		self._clear_tagtypes()
+		self._use_tagtypes("none")
 		self._send_command(f"find {album.tag_filter()} window 0:1")
-		song=self._parse_song()
-		self._set_default_tagtypes()
-		return self._get_cover(song)
+		return self._get_cover(self._parse_song())
+
+	def get_album_contents(self, album):
+		key=(album.artist.name, album.artist.sortname, album.name, album.date)
+		if (contents:=self._album_cache.get(key)) is None:
+			songs=list(self.get_songs(album))
+			duration=Duration(sum(float(song["duration"]) for song in songs if "duration" in song))
+			if songs:
+				contents=(songs, duration, self._get_cover(songs[0]))
+			else:
+				contents=(songs, duration, FALLBACK_COVER)
+			self._album_cache.put(key, contents)
+		return contents
+
+	def get_playlist_window(self, start, end):
+		self._use_tagtypes("playlist")
+		self._send_command(f"playlistinfo {start}:{end}")
+		return list(self._parse_songs())
+
+	def get_playlist_songs(self, songids):
+		# bounded command lists stay below the max_command_list_size of the server
+		self._use_tagtypes("playlist")
+		songids=list(songids)
+		songs=[]
+		try:
+			for start in range(0, len(songids), self._COMMAND_LIST_SIZE):
+				self._send_command_list(f"playlistid {songid}" for songid in songids[start:start+self._COMMAND_LIST_SIZE])
+				for song in self._parse_songs():
+					songs.append(song)
+		except CommandError:  # queue changed in the meantime, the remaining songs are fetched with their windows
+			pass
+		return songs
 
-	def get_duration(self, album):
-		self._send_command(f"count {album.tag_filter()}")
-		return Duration(self._parse_dict()["playtime"])
+	def stream_playlist(self, profile):
+		self._use_tagtypes(profile)
+		self._send_command("playlistinfo")
+		return self._start_stream(self._parse_songs())
 
 	def get_playlist_changes(self, version):
-		if version is None:
-			self._send_command("playlistinfo")
-		else:
-			self._send_command(f"plchanges {version}")
-		for song in self._parse_songs():
-			yield song
+		# views syncing from the same version share the response
+		if self._playlist_changes[:2] != (version, self._cached_status.get("playlist")):
+			self._send_command(f"plchangesposid {version}")
+			changes=[]
+			for key, value in self._parse_pairs():
+				if key == "cpos":
+					position=int(value)
+				else:
+					changes.append((position, value))
+			self._playlist_changes=(version, self._cached_status.get("playlist"), changes)
+		return self._playlist_changes[2]
 
 	def get_absolute_path(self, song):
 		stripped_uri=re.sub(r"(.*\.cue)\/track\d+$", r"\1", song["file"], flags=re.IGNORECASE)
@@ -796,14 +1728,15 @@ class Client(GObject.Object):
 				None, Gio.DBusCallFlags.NONE, -1, fd_list)
 
 	def can_show_album(self, song):
-		self._clear_tagtypes()
+		self._use_tagtypes("none")
 		self._send_command(f"find file {song.get_quoted_file()}")
-		song=self._parse_song()
-		self._set_default_tagtypes()
-		return bool(song)
+		return bool(self._parse_song())
 
 	def show_album(self, song):
-		self.emit("show-album", song.get_album())
+		# songs of the playlist don't carry album tags
+		self._use_tagtypes("default")
+		self._send_command(f"find file {song.get_quoted_file()}")
+		self.emit("show-album", self._parse_song().get_album())
 
 	def toggle_play(self):
 		if self.get_state() == "stop":
@@ -813,7 +1746,7 @@ class Client(GObject.Object):
 
 	def get_state(self): return self._cached_status.get("state", "stop")
 	def get_volume(self): return int(self._cached_status.get("volume", "0"))
-	def get_elapsed(self): return float(self._cached_status.get("elapsed", "0"))
+	def get_elapsed(self): return self.clock.get_elapsed()
 	def get_playlistlength(self): return int(self._cached_status.get("playlistlength", "0"))
 	def get_songid(self): return self._cached_status.get("songid")
 	def get_random(self): return self._cached_status.get("random", "0") != "0"
@@ -873,16 +1806,76 @@ class Client(GObject.Object):
 	def _get_cover(self, song):
 		return self._get_cover_with_path(song)[0]
 
-	def _set_default_tagtypes(self):
-		self._run_command("tagtypes reset track title artist album albumartist albumartistsort date")
+	def _use_tagtypes(self, profile):
+		if profile != self._tagtypes:
+			if (tags:=self._TAGTYPES[profile]):
+				self._send_command(f"tagtypes reset {' '.join(tags)}")
+			else:
+				self._send_command("tagtypes clear")
+			self._clear_response()
+			self._tagtypes=profile
+
+	def _clear_caches(self):
+		self._search_cache.clear()
+		self._album_cache.clear()
+		self._album_entries=None
+		self._facets=None
+		self._directory_cache.clear()
+		self._playlist_changes=(None, None, [])
 
-	def _clear_tagtypes(self):
-		self._run_command("tagtypes clear")
+	def _on_songid(self, client, song, *args):
+		# pre-warm the playing album for "show album", streams and untagged songs would match unrelated songs
+		if song and "album" in song and self.can_show_album(song):
+			self.prefetcher.add(song.get_album(), delay=0)
 
 	def _database_is_empty(self):
 		return self.stats().get("songs", "0") == "0"
 
+	def set_window_visible(self, visible):
+		if visible != self._window_visible:
+			self._window_visible=visible
+			self._reschedule_poll()
+
+	def _get_poll_interval(self):
+		# milliseconds, full rate only right after a command, the playback clock extrapolates the elapsed time in between
+		if GLib.get_monotonic_time() < self._active_until:
+			return self._ACTIVE_INTERVAL
+		state=self.get_state()
+		interval=self._POLL_INTERVALS[(state, self._window_visible)]
+		if self._power_profile_monitor.get_power_saver_enabled() or self._network_monitor.get_network_metered():
+			interval*=4
+		if state == "play" and (duration:=self.clock.get_duration()) > 0:  # catch the next song in time
+			interval=min(interval, max(self._ACTIVE_INTERVAL, int((duration-self.clock.get_elapsed())*1000)+50))
+		return interval
+
+	def _schedule_poll(self):
+		interval=self._get_poll_interval()
+		self._poll=(GLib.timeout_add(interval, self._on_poll), interval)
+
+	def _reschedule_poll(self):
+		if self._poll is not None:
+			GLib.source_remove(self._poll[0])
+			self._schedule_poll()
+
+	def _poke(self):
+		# called for every command changing the state of the server, these are only sent on behalf of the user (window, shortcuts, MPRIS),
+		# queries go through _send_command directly and don't count as interaction
+		self._active_until=GLib.get_monotonic_time()+self._ACTIVE_TIME
+		if self._poll is not None and self._poll[1] > self._ACTIVE_INTERVAL:
+			self._reschedule_poll()
+
+	def _on_poll(self):
+		self._poll=None
+		if self._main_loop():
+			self._schedule_poll()
+		return False
+
+	def _on_poll_conditions_changed(self, *args):
+		self._reschedule_poll()
+
 	def _main_loop(self, *args):
+		if self.is_streaming():  # don't interrupt a response which is still being read
+			return True
 		try:
 			song=None
 			last_status=self._cached_status
@@ -900,11 +1893,14 @@ class Client(GObject.Object):
 				self.emit("songid", song, cover, cover_path, self._cached_status["song"], songid, self._cached_status["state"])
 			elif song is not None:
 				self.emit("metadata", song)
-			if (elapsed:=diff.get("elapsed")) is not None:
-				elapsed=float(elapsed)
-				self.emit("elapsed", elapsed, float(self._cached_status.get("duration", 0.0)))
-				# check if playback position has changed by more than two times the polling interval which indicates a seek event
-				if (last_elapsed:=last_status.get("elapsed")) is not None and abs(elapsed-float(last_elapsed)) > 0.2:
+			# the elapsed time is only emitted if it doesn't match the local clock
+			elapsed=float(self._cached_status.get("elapsed", 0.0))
+			duration=float(self._cached_status.get("duration", 0.0))
+			# a song repeated by "repeat single" or a queue of one song starts over without a new song id
+			restarted=self.clock.at_end() and elapsed < self.clock.get_elapsed()
+			if self.clock.sync(elapsed, duration, self._cached_status.get("state") == "play"):
+				self.emit("elapsed", elapsed, duration)
+				if "elapsed" in last_status and "songid" not in diff and "state" not in diff and not restarted:
 					self.emit("seeked", elapsed)
 			if (bitrate:=diff.get("bitrate")) is not None:
 				if bitrate == "0":
@@ -926,6 +1922,7 @@ class Client(GObject.Object):
 				elif "volume" == key:
 					self.emit("volume", -1)
 				elif "updating_db" == key:
+					self._clear_caches()
 					self.emit("updated-db", self._database_is_empty())
 				elif "bitrate" == key:
 					self.emit("bitrate", None)
@@ -937,6 +1934,7 @@ class Client(GObject.Object):
 			return False
 
 	def currentsong(self):
+		self._use_tagtypes("default")
 		self._send_command("currentsong")
 		return self._parse_song()
 
@@ -983,12 +1981,14 @@ class Settings(Gio.Settings):
 class PreferencesDialog(Adw.PreferencesDialog):
 	__gtype_name__="PreferencesDialog"
 	show_bit_rate=Gtk.Template.Child()
+	search_results=Gtk.Template.Child()
 	send_notify=Gtk.Template.Child()
 	stop_on_quit=Gtk.Template.Child()
 	mpris=Gtk.Template.Child()
 	def __init__(self, settings):
 		super().__init__()
 		settings.bind("show-bit-rate", self.show_bit_rate, "active", Gio.SettingsBindFlags.DEFAULT)
+		settings.bind("search-results", self.search_results, "value", Gio.SettingsBindFlags.DEFAULT)
 		settings.bind("send-notify", self.send_notify, "active", Gio.SettingsBindFlags.DEFAULT)
 		settings.bind("stop-on-quit", self.stop_on_quit, "active", Gio.SettingsBindFlags.DEFAULT)
 		settings.bind("mpris", self.mpris, "active", Gio.SettingsBindFlags.DEFAULT)
@@ -1102,54 +2102,95 @@ class HeadingBox(Gtk.Box):
 		self.append(Gtk.Label(label=heading, xalign=0, css_classes=["heading"]))
 		self.append(widget)
 
-class SelectionModel(GObject.Object, Gio.ListModel, Gtk.SelectionModel):
+class SelectionModel(GObject.Object, Gio.ListModel, Gtk.SelectionModel, Gtk.SectionModel):
 	show_selection=GObject.Property(type=bool, default=True)
-	def __init__(self, item_type):
+	def __init__(self, item_type, multiple=False):
 		super().__init__()
 		self._item_type=item_type
+		self._multiple=multiple
 		self._data=[]
 		self._selected=None
+		self._selection=Gtk.Bitset.new_empty()  # positions selected by the user, models with multiple selection don't show the selected item
 
 		# connect
 		self.connect("notify::show-selection", self._on_show_selection)
 
 	def clear(self, position=0):
-		n=self.get_n_items()-position
-		self._data=self._data[:position]
-		if self._selected is not None and self._selected >= self.get_n_items():
-			self._selected=None
-		self.items_changed(position, n, 0)
+		self.splice(position, self.get_n_items()-position, [])
 
 	def append(self, data):
-		n=self.get_n_items()
-		self._data.extend(data)
-		self.items_changed(n, 0, self.get_n_items())
+		self.splice(self.get_n_items(), 0, data)
+
+	def splice(self, position, n_removals, additions):
+		self.apply([(position, n_removals, additions)])
+
+	def apply(self, splices):
+		"""
+		Apply several splices with positions relative to the current items.
+		Touching splices are merged, the rest is applied from the end to keep the positions valid.
+		"""
+		merged=[]
+		for position, n_removals, additions in sorted(splices, key=lambda splice: splice[0]):
+			if merged and merged[-1][0]+merged[-1][1] == position:
+				last_position,last_removals,last_additions=merged.pop()
+				merged.append((last_position, last_removals+n_removals, last_additions+list(additions)))
+			else:
+				merged.append((position, n_removals, list(additions)))
+		for position, n_removals, additions in reversed(merged):
+			self._data[position:position+n_removals]=additions
+			self._selection.splice(position, n_removals, len(additions))
+			if self._selected is not None and self._selected >= position:
+				if self._selected < position+n_removals:
+					self._selected=None
+				else:
+					self._selected+=len(additions)-n_removals
+			self.items_changed(position, n_removals, len(additions))
+
+	def insert_sorted(self, items, key):
+		self.apply([(bisect.bisect_right(self._data, key(item), key=key), 0, [item]) for item in sorted(items, key=key)])
+
+	def _items_changed_coalesced(self, positions, n_items, length):
+		# emit one signal per run of changed positions, a run reaching the end is merged with the change of length
+		n=min(n_items, length)
+		runs=[]
+		for position in sorted(position for position in positions if position < n):
+			if runs and runs[-1][1] == position:
+				runs[-1][1]+=1
+			else:
+				runs.append([position, position+1])
+		if n_items != length:
+			start=runs.pop()[0] if runs and runs[-1][1] == n else n
+			self.items_changed(start, n_items-start, length-start)
+		for start, end in reversed(runs):
+			self.items_changed(start, end-start, end-start)
 
 	def get_selected(self):
 		return self._selected
 
-	def set(self, position, item):
-		if position < len(self._data):
-			self._data[position]=item
-			self.items_changed(position, 1, 1)
-		else:
-			self._data.append(item)
-			self.items_changed(position, 0, 1)
+	def get_selected_positions(self):
+		return [self._selection.get_nth(i) for i in range(self._selection.get_size())]
+
+	def _change_selection(self, change, *args):
+		if self._multiple:
+			change(*args)
+			self.selection_changed(0, self.get_n_items())
+		return self._multiple
 
 	def select(self, position):
 		if position != self._selected:
 			self.unselect()
 			self._selected=position
-			self.selection_changed(self._selected, 1)
+			if not self._multiple:
+				self.selection_changed(self._selected, 1)
 
 	def unselect(self):
 		old_selected=self._selected
 		self._selected=None
-		if old_selected is not None:
+		if old_selected is not None and not self._multiple:
 			self.selection_changed(old_selected, 1)
 
 	def _on_show_selection(self, *args):
-		if self._selected is not None:
+		if self._selected is not None and not self._multiple:
 			self.selection_changed(self._selected, 1)
 
 	# Gio.ListModel methods
@@ -1163,15 +2204,132 @@ class SelectionModel(GObject.Object, Gio.ListModel, Gtk.SelectionModel):
 	def do_get_n_items(self): return len(self._data)
 
 	# Gtk.SelectionModel methods
-	def do_select_item(self, position, unselect_rest): return False
-	def do_select_all(self): return False
-	def do_select_range(self, position, n_items, unselect_rest): return False
+	def do_select_item(self, position, unselect_rest):
+		if unselect_rest:  # plain clicks and hovering don't start a selection
+			return False
+		return self._change_selection(self._selection.add, position)
+
+	def do_select_range(self, position, n_items, unselect_rest):
+		if unselect_rest:
+			self._selection.remove_all()
+		return self._change_selection(self._selection.add_range, position, n_items)
+
+	def do_select_all(self): return self._change_selection(self._selection.add_range, 0, self.get_n_items())
 	def do_set_selection(self, selected, mask): return False
-	def do_unselect_all(self): return False
-	def do_unselect_item(self, position): return False
-	def do_unselect_range(self, position, n_items): return False
-	def do_get_selection_in_range(self, position, n_items): return False
-	def do_is_selected(self, position): return position == self._selected and self.get_property("show-selection")
+	def do_unselect_all(self): return self._selection.is_empty() or self._change_selection(self._selection.remove_all)
+	def do_unselect_item(self, position): return self._change_selection(self._selection.remove, position)
+	def do_unselect_range(self, position, n_items): return self._change_selection(self._selection.remove_range, position, n_items)
+
+	def do_get_selection_in_range(self, position, n_items):
+		if self._multiple:
+			return self._selection.copy()
+		selection=Gtk.Bitset.new_empty()
+		if self._selected is not None and self.get_property("show-selection"):
+			selection.add(self._selected)
+		return selection
+
+	def do_is_selected(self, position):
+		if self._multiple:
+			return self._selection.contains(position)
+		return position == self._selected and self.get_property("show-selection")
+
+	# Gtk.SectionModel methods
+	def do_get_section(self, position):
+		if position >= (n:=self.get_n_items()):
+			return (n, GLib.MAXUINT)
+		return (0, n)
+
+class PlaylistModel(SelectionModel):
+	"""
+	Selection model of the queue which only knows its length up front.
+	Songs are fetched in windows when they are requested, only recently used windows are kept.
+	"""
+	_WINDOW_SIZE=100
+	def __init__(self, client):
+		super().__init__(Song, multiple=True)
+		self._client=client
+		self._length=0
+		self._windows=LRUCache(32)
+
+	def clear(self, position=0):
+		self.update([], position)
+
+	def reset(self, length):
+		n=self._length
+		self._length=length
+		self._windows.clear()
+		self._selection.remove_all()
+		if self._selected is not None and self._selected >= length:
+			self._selected=None
+		self.items_changed(0, n, length)
+
+	def update(self, changes, length):
+		# songs which only moved are reused, songs unknown to the resident windows are fetched with a single command list
+		known={song["id"]: song for window, songs in self._windows.items() for song in songs}
+		selected={}  # selected songs by id, selected positions outside of the resident windows are dropped
+		for position in self.get_selected_positions():
+			window,offset=divmod(position, self._WINDOW_SIZE)
+			if (songs:=self._windows.get(window)) is not None and offset < len(songs):
+				selected[songs[offset]["id"]]=position
+		resident=sorted((position, songid) for position, songid in changes if position < length and position//self._WINDOW_SIZE in self._windows)
+		# a change without a move means the tags changed, e.g. the title of a stream
+		for position, songid in resident:
+			if (song:=known.get(songid)) is not None and (song["pos"] == str(position) or "://" in song["file"]):
+				del known[songid]
+		if (missing:=[songid for position, songid in resident if songid not in known]):
+			known.update((song["id"], song) for song in self._client.get_playlist_songs(missing))
+		outdated=set()
+		for position, songid in resident:
+			window,offset=divmod(position, self._WINDOW_SIZE)
+			songs=self._windows.get(window)
+			if (song:=known.get(songid)) is None or offset > len(songs):
+				outdated.add(window)
+				continue
+			song["pos"]=str(position)
+			if offset == len(songs):
+				songs.append(song)
+			else:
+				songs[offset]=song
+		for window, songs in self._windows.items():
+			if (start:=window*self._WINDOW_SIZE) >= length:
+				outdated.add(window)
+			else:
+				del songs[length-start:]
+		for window in outdated:
+			self._windows.pop(window)
+		n_items=self._length
+		self._length=length
+		if self._selected is not None and self._selected >= length:
+			self._selected=None
+		self._items_changed_coalesced((position for position, songid in changes), n_items, length)
+		if selected or not self._selection.is_empty():  # the selection follows the songs which moved
+			positions={songid: position for position, songid in changes}
+			changed=set(positions.values())
+			self._selection.remove_all()
+			for songid, position in selected.items():
+				if songid in positions:
+					self._selection.add(positions[songid])
+				elif position < length and position not in changed:
+					self._selection.add(position)
+			self.selection_changed(0, length)
+
+	# Gio.ListModel methods
+	def do_get_item(self, position):
+		if position < self._length:
+			window,offset=divmod(position, self._WINDOW_SIZE)
+			if (songs:=self._windows.get(window)) is None:
+				start=window*self._WINDOW_SIZE
+				songs=self._client.get_playlist_window(start, start+self._WINDOW_SIZE)
+				self._windows.put(window, songs)
+			if offset < len(songs):
+				return songs[offset]
+			# the queue shrank on the server, the placeholder is replaced once the change is polled
+			placeholder=Song()
+			placeholder["file"]=""
+			placeholder["pos"]=str(position)
+			return placeholder
+
+	def do_get_n_items(self): return self._length
 
 class SongMenu(Gtk.PopoverMenu):
 	def __init__(self, client, show_album=False):
@@ -1179,19 +2337,20 @@ class SongMenu(Gtk.PopoverMenu):
 		self.update_property([Gtk.AccessibleProperty.LABEL], [_("Context menu")])
 		self._client=client
 		self._song=None
+		self._songs=[]
 
 		# action group
 		action_group=Gio.SimpleActionGroup()
 		action=Gio.SimpleAction.new("append", None)
-		action.connect("activate", lambda *args: self._client.append_song(self._song))
+		action.connect("activate", lambda *args: self._client.append_songs(self._songs))
 		action_group.add_action(action)
 		action=Gio.SimpleAction.new("as-next", None)
-		action.connect("activate", lambda *args: self._client.as_next_song(self._song))
+		action.connect("activate", lambda *args: self._client.as_next_songs(self._songs))
 		action_group.add_action(action)
+		self._show_album_action=Gio.SimpleAction.new("show-album", None)
+		self._show_album_action.connect("activate", lambda *args: self._client.show_album(self._song))
 		if show_album:
-			action=Gio.SimpleAction.new("show-album", None)
-			action.connect("activate", lambda *args: self._client.show_album(self._song))
-			action_group.add_action(action)
+			action_group.add_action(self._show_album_action)
 		self._show_file_action=Gio.SimpleAction.new("show-file", None)
 		self._show_file_action.connect("activate", lambda *args: self._client.show_file(self._song))
 		action_group.add_action(self._show_file_action)
@@ -1208,36 +2367,64 @@ class SongMenu(Gtk.PopoverMenu):
 		menu.append_section(None, subsection)
 		self.set_menu_model(menu)
 
-	def open(self, song, x, y):
-		self._song=song
+	def open(self, songs, x, y):
+		self._songs=songs
+		self._song=songs[0]
 		rect=Gdk.Rectangle()
 		rect.x,rect.y=x,y
 		self.set_pointing_to(rect)
-		self._show_file_action.set_enabled(self._client.can_show_file(self._song))
+		self._show_album_action.set_enabled(len(songs) == 1)
+		self._show_file_action.set_enabled(len(songs) == 1 and self._client.can_show_file(self._song))
 		self.popup()
 
-class SongActionRow(Adw.ActionRow):
-	def __init__(self, song, show_track=True, hide_artist="", **kwargs):
-		super().__init__(use_markup=False, activatable=True, **kwargs)
-		self.song=song
+class SongRow(Gtk.Box):
+	position=GObject.Property(type=int, default=-1)
+	def __init__(self, show_track=False, hide_artist="", **kwargs):
+		# can_target=False is needed to use Gtk.Widget.pick() in Gtk.ListView
+		super().__init__(can_target=False, **kwargs)
+		self._hide_artist=hide_artist
+
+		# labels
+		self._track=Gtk.Label(xalign=1, single_line_mode=True, width_chars=3, css_classes=["numeric", "dimmed"], visible=show_track)
+		self._title=Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END)
+		self._subtitle=Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, css_classes=["dimmed", "caption"])
+		self._length=Gtk.Label(xalign=1, single_line_mode=True, css_classes=["numeric", "dimmed"])
+
+		# packing
+		self._box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL, valign=Gtk.Align.CENTER, hexpand=True)
+		self._box.append(self._title)
+		self._box.append(self._subtitle)
+		self.append(self._track)
+		self.append(self._box)
+		self.append(self._length)
 
-		# populate
-		self.set_title(song["title"][0])
-		if subtitle:=", ".join(artist for artist in song["artist"] if artist != hide_artist):
-			self.set_subtitle(subtitle)
-		length=Gtk.Label(label=str(song["duration"]), xalign=1, single_line_mode=True, css_classes=["numeric", "dimmed"])
-		self.add_suffix(length)
-		if show_track:
-			track=Gtk.Label(label=song["track"][0], xalign=1, single_line_mode=True, width_chars=3, css_classes=["numeric", "dimmed"])
-			self.add_prefix(track)
-
-class SongList(Gtk.ListBox):
-	def __init__(self, client, show_album=False):
-		super().__init__(selection_mode=Gtk.SelectionMode.NONE, tab_behavior=Gtk.ListTabBehavior.ITEM, valign=Gtk.Align.START)
+	def _set_text(self, title, subtitle, length):
+		self._title.set_text(title)
+		self._subtitle.set_visible(bool(subtitle))
+		self._subtitle.set_text(subtitle)
+		self._length.set_text(length)
+
+	def set_song(self, song):
+		track,title,subtitle,length=song.get_display(self._hide_artist)
+		self._track.set_text(track)
+		self._set_text(title, subtitle, length)
+
+	def unset_song(self):
+		self._track.set_text("")
+		self._title.set_text("")
+		self._subtitle.set_text("")
+		self._length.set_text("")
+
+class SongListView(Gtk.ListView):
+	def __init__(self, client, show_album=False, **kwargs):
+		super().__init__(tab_behavior=Gtk.ListTabBehavior.ITEM, single_click_activate=True, **kwargs)
 		self._client=client
+		self._anchor=None
+		self.add_css_class("song-list")
 
 		# menu
 		self._menu=SongMenu(client, show_album=show_album)
+		self._menu.set_parent(self)
 
 		# action group
 		action_group=Gio.SimpleActionGroup()
@@ -1253,6 +2440,8 @@ class SongList(Gtk.ListBox):
 		# event controller
 		button_controller=Gtk.GestureClick(button=0)
 		self.add_controller(button_controller)
+		select_controller=Gtk.GestureClick(button=1, propagation_phase=Gtk.PropagationPhase.CAPTURE)
+		self.add_controller(select_controller)
 		long_press_controller=Gtk.GestureLongPress()
 		self.add_controller(long_press_controller)
 		drag_source=Gtk.DragSource()
@@ -1260,52 +2449,73 @@ class SongList(Gtk.ListBox):
 		self.add_controller(drag_source)
 
 		# connect
-		self.connect("row-activated", self._on_row_activated)
-		self.connect("keynav-failed", self._on_keynav_failed)
+		self.connect("activate", self._on_activate)
 		button_controller.connect("pressed", self._on_button_pressed)
+		select_controller.connect("pressed", self._on_select_pressed)
 		long_press_controller.connect("pressed", self._on_long_pressed)
 		drag_source.connect("prepare", self._on_drag_prepare)
 
-	def remove_all(self):
-		self._menu.unparent()
-		super().remove_all()
-
-	def _open_menu(self, row, x, y):
-		self._menu.unparent()
-		self._menu.set_parent(row)
-		point=Graphene.Point.zero()
-		point.x,point.y=x,y
-		computed_point,point=self.compute_point(row, point)
-		if computed_point:
-			self._menu.open(row.song, point.x, point.y)
-
-	def _on_row_activated(self, list_box, row):
-		self._client.play_song(row.song)
-
-	def _on_keynav_failed(self, list_box, direction):
-		if (root:=list_box.get_root()) is not None and direction == Gtk.DirectionType.UP:
-			root.child_focus(Gtk.DirectionType.TAB_BACKWARD)
+	def _get_position(self, x, y):
+		item=self.pick(x,y,Gtk.PickFlags.DEFAULT)
+		if item is not None and isinstance(row:=item.get_first_child(), SongRow):
+			return row.get_property("position")
+
+	def _get_song(self, position):
+		if position is not None and isinstance(item:=self.get_model().get_item(position), Song):
+			return item
+
+	def _get_songs(self, position):
+		# actions on a selected song apply to the whole selection
+		if position in (positions:=self.get_model().get_selected_positions()):
+			return [song for position in positions if (song:=self._get_song(position)) is not None]
+		return [self._get_song(position)]
+
+	def _on_activate(self, list_view, pos):
+		if (song:=self._get_song(pos)) is not None:
+			self._client.play_song(song)
+
+	def _on_select_pressed(self, controller, n_press, x, y):
+		state=controller.get_current_event_state()
+		if self._get_song(position:=self._get_position(x,y)) is None:
+			return
+		if state & (Gdk.ModifierType.CONTROL_MASK|Gdk.ModifierType.SHIFT_MASK):
+			controller.set_state(Gtk.EventSequenceState.CLAIMED)
+			model=self.get_model()
+			if state & Gdk.ModifierType.SHIFT_MASK and self._anchor is not None:
+				start=min(self._anchor, position)
+				model.select_range(start, abs(position-self._anchor)+1, not state & Gdk.ModifierType.CONTROL_MASK)
+			elif position in model.get_selected_positions():
+				model.unselect_item(position)
+			else:
+				model.select_item(position, False)
+			self._anchor=position
+		else:
+			self.get_model().unselect_all()
+			self._anchor=position
 
 	def _on_button_pressed(self, controller, n_press, x, y):
-		if (row:=self.get_row_at_y(y)) is not None:
+		if (position:=self._get_position(x,y)) is not None and self._get_song(position) is not None:
 			if controller.get_current_button() == 2 and n_press == 1:
-				self._client.append_song(row.song)
+				self._client.append_songs(self._get_songs(position))
 			elif controller.get_current_button() == 3 and n_press == 1:
-				self._open_menu(row, x, y)
+				self._menu.open(self._get_songs(position), x, y)
 
 	def _on_long_pressed(self, controller, x, y):
-		if (row:=self.get_row_at_y(y)) is not None:
-			self._open_menu(row, x, y)
+		if (position:=self._get_position(x,y)) is not None and self._get_song(position) is not None:
+			self._menu.open(self._get_songs(position), x, y)
 
 	def _on_menu(self, action, state):
-		row=self.get_focus_child()
-		self._menu.unparent()
-		self._menu.set_parent(row)
-		self._menu.open(row.song, 0, 0)
+		row=self.get_focus_child().get_first_child()
+		if isinstance(row, SongRow) and self._get_song(position:=row.get_property("position")) is not None:
+			computed_point,point=row.compute_point(self, Graphene.Point.zero())
+			if computed_point:
+				self._menu.open(self._get_songs(position), point.x, point.y)
+			else:
+				self._menu.open(self._get_songs(position), 0, 0)
 
 	def _on_drag_prepare(self, drag_source, x, y):
-		if (row:=self.get_row_at_y(y)) is not None:
-			return Gdk.ContentProvider.new_for_value(row.song)
+		if (song:=self._get_song(self._get_position(x,y))) is not None:
+			return Gdk.ContentProvider.new_for_value(song)
 
 class AlbumCover(Gtk.Widget):
 	def __init__(self, **kwargs):
@@ -1339,179 +2549,413 @@ class AlbumCover(Gtk.Widget):
 # browser #
 ###########
 
-class AlbumActionRow(Adw.ActionRow):
-	def __init__(self, album):
-		super().__init__(use_markup=False, activatable=True, css_classes=["property"])
-		self.album=album
-		self.set_title(album.artist.name)
-		self.set_subtitle(album.name)
-		self.add_suffix(Gtk.Label(label=album.date, use_markup=False, xalign=1, single_line_mode=True, css_classes=["numeric", "dimmed"]))
-		self.add_suffix(Gtk.Image(icon_name="go-next-symbolic", accessible_role=Gtk.AccessibleRole.PRESENTATION))
-
-class ArtistActionRow(Adw.ActionRow):
-	def __init__(self, artist):
-		super().__init__(use_markup=False, activatable=True)
-		self.artist=artist
-		self.set_title(artist.name)
-		self.add_suffix(Gtk.Image(icon_name="go-next-symbolic", accessible_role=Gtk.AccessibleRole.PRESENTATION))
+class LoadMore(GObject.Object):
+	def __init__(self, kind):
+		GObject.Object.__init__(self)
+		self.kind=kind
+		self.loading=False
+
+class SearchRow(SongRow):
+	def __init__(self):
+		super().__init__()
+		self._arrow=Gtk.Image(icon_name="go-next-symbolic", accessible_role=Gtk.AccessibleRole.PRESENTATION, visible=False)
+		self._spinner=Adw.Spinner(hexpand=True, visible=False)
+		self.append(self._arrow)
+		self.append(self._spinner)
+
+	def set_item(self, item):
+		self._box.set_visible(not isinstance(item, LoadMore))
+		self._spinner.set_visible(isinstance(item, LoadMore))
+		self._arrow.set_visible(isinstance(item, (Album, Artist)))
+		if isinstance(item, Song):
+			self.set_song(item)
+		elif isinstance(item, Album):
+			self._set_text(item.artist.name, item.name, item.date)
+		elif isinstance(item, Artist):
+			self._set_text(item.name, "", "")
+		else:
+			self.unset_song()
+
+class SearchModel(SelectionModel):
+	def __init__(self):
+		super().__init__(GObject.Object, multiple=True)
+		self.set_property("show-selection", False)
+		self._sections=dict.fromkeys(("artists", "albums", "songs"), 0)
+
+	def clear(self):
+		self._sections=dict.fromkeys(self._sections, 0)
+		super().clear()
+
+	def _get_start(self, kind):
+		start=0
+		for section, length in self._sections.items():
+			if section == kind:
+				return start
+			start+=length
+
+	def get_load_more_position(self, load_more):
+		position=self._get_start(load_more.kind)+self._sections[load_more.kind]-1
+		if self.get_item(position) is load_more:
+			return position
+
+	def extend(self, kind, items, more):
+		position=self._get_start(kind)+self._sections[kind]
+		n_removals=int(self._sections[kind] > 0 and isinstance(self.get_item(position-1), LoadMore))
+		additions=items+[LoadMore(kind)]*more
+		self._sections[kind]+=len(additions)-n_removals
+		self.splice(position-n_removals, n_removals, additions)
+
+	# Gtk.SectionModel methods
+	def do_get_section(self, position):
+		start=0
+		for length in self._sections.values():
+			if position < start+length:
+				return (start, start+length)
+			start+=length
+		return (start, GLib.MAXUINT)
 
 class SearchView(Gtk.Stack):
 	__gsignals__={"artist-selected": (GObject.SignalFlags.RUN_FIRST, None, (Artist,)),
 			"album-selected": (GObject.SignalFlags.RUN_FIRST, None, (Album,))}
-	def __init__(self, client):
+	def __init__(self, client, settings):
 		super().__init__()
 		self._client=client
-		self._results=20  # TODO adjust number of results
-
-		# artist list
-		self._artist_list=Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE, tab_behavior=Gtk.ListTabBehavior.ITEM, valign=Gtk.Align.START)
-		self._artist_list.add_css_class("boxed-list")
-
-		# album list
-		self._album_list=Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE, tab_behavior=Gtk.ListTabBehavior.ITEM, valign=Gtk.Align.START)
-		self._album_list.add_css_class("boxed-list")
+		self._settings=settings
+		self._keywords=[]
+		self._search={"artists": client.search_artists, "albums": client.search_albums, "songs": client.search_songs}
+		self._loader=None
 
-		# song list
-		self._song_list=SongList(client, show_album=True)
-		self._song_list.add_css_class("boxed-list")
+		# factories
+		def setup(factory, item):
+			item.set_child(SearchRow())
+		def bind(factory, item):
+			row=item.get_child()
+			row.set_item(item.get_item())
+			row.set_property("position", item.get_position())
+			if isinstance(item.get_item(), LoadMore):
+				idle_add(self._load_more, item.get_item())
+		def unbind(factory, item):
+			row=item.get_child()
+			row.unset_song()
+			row.set_property("position", -1)
+		factory=Gtk.SignalListItemFactory()
+		factory.connect("setup", setup)
+		factory.connect("bind", bind)
+		factory.connect("unbind", unbind)
+		def header_setup(factory, header):
+			header.set_child(Gtk.Label(xalign=0, can_target=False, css_classes=["heading"]))
+		def header_bind(factory, header):
+			item=header.get_item()
+			if isinstance(item, Artist):
+				header.get_child().set_text(_("Artists"))
+			elif isinstance(item, Album):
+				header.get_child().set_text(_("Albums"))
+			else:
+				header.get_child().set_text(_("Songs"))
+		header_factory=Gtk.SignalListItemFactory()
+		header_factory.connect("setup", header_setup)
+		header_factory.connect("bind", header_bind)
 
-		# boxes
-		self._artist_box=HeadingBox(_("Artists"), self._artist_list)
-		self._album_box=HeadingBox(_("Albums"), self._album_list)
-		self._song_box=HeadingBox(_("Songs"), self._song_list)
-		box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=30, margin_start=12, margin_end=12, margin_top=24, margin_bottom=24)
-		box.append(self._artist_box)
-		box.append(self._album_box)
-		box.append(self._song_box)
+		# list view
+		self._model=SearchModel()
+		self._list_view=SongListView(client, show_album=True, model=self._model, factory=factory, header_factory=header_factory)
 
 		# scroll
-		scroll=Gtk.ScrolledWindow(child=Adw.Clamp(child=box))
+		scroll=Gtk.ScrolledWindow(child=Adw.ClampScrollable(child=self._list_view))
 		self._adj=scroll.get_vadjustment()
 
 		# status page
 		status_page=Adw.StatusPage(icon_name="edit-find-symbolic", title=_("No Results"), description=_("Try a different search"))
 
 		# connect
-		self._artist_list.connect("row-activated", self._on_artist_activate)
-		self._artist_list.connect("keynav-failed", self._on_keynav_failed)
-		self._album_list.connect("row-activated", self._on_album_activate)
-		self._album_list.connect("keynav-failed", self._on_keynav_failed)
+		self._list_view.connect("activate", self._on_activate)
 
 		# packing
 		self.add_named(status_page, "no-results")
 		self.add_named(scroll, "results")
 
 	def clear(self):
-		self._artist_list.remove_all()
-		self._album_list.remove_all()
-		self._song_list.remove_all()
+		if self._loader is not None:
+			SCHEDULER.remove(self._loader)
+			self._loader=None
+		self._keywords=[]
+		self._model.clear()
 		self._adj.set_value(0.0)
 		self.set_visible_child_name("no-results")
 
 	def search(self, search_text):
 		self.clear()
 		if (keywords:=search_text.split()):
-			for song in self._client.search_songs(keywords, self._results):
-				self._song_list.append(SongActionRow(song, show_track=False))
-			self._song_box.set_visible(self._song_list.get_first_child() is not None)
-			for album in self._client.search_albums(keywords, self._results):
-				self._album_list.append(AlbumActionRow(album))
-			self._album_box.set_visible(self._album_list.get_first_child() is not None)
-			for artist in self._client.search_artists(keywords, self._results):
-				self._artist_list.append(ArtistActionRow(artist))
-			self._artist_box.set_visible(self._artist_list.get_first_child() is not None)
-			if self._song_box.get_visible() or self._album_box.get_visible() or self._artist_box.get_visible():
-				self.set_visible_child_name("results")
-
-	def _on_artist_activate(self, list_box, row):
-		self.emit("artist-selected", row.artist)
+			self._keywords=keywords
+			self._loader=SCHEDULER.add(self._load_kind, iter(self._search), priority=GLib.PRIORITY_DEFAULT)
 
-	def _on_album_activate(self, list_box, row):
-		self.emit("album-selected", row.album)
+	def _load_kind(self, kinds):
+		# one category per slice to let the results show up between the requests
+		if (kind:=next(kinds, None)) is not None:
+			try:
+				self._load(kind, 0)
+			except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+				self._loader=None
+				self._client.close_connection()
+				return False
+			except ValueError:  # Connection closed by user
+				self._loader=None
+				return False
+			if self._model.get_n_items():
+				self.set_visible_child_name("results")
+			return True
+		self._loader=None
+		return False
 
-	def _on_keynav_failed(self, list_box, direction):
-		if (root:=list_box.get_root()) is not None:
-			if direction == Gtk.DirectionType.UP:
-				root.child_focus(Gtk.DirectionType.TAB_BACKWARD)
-			elif direction == Gtk.DirectionType.DOWN:
-				root.child_focus(Gtk.DirectionType.TAB_FORWARD)
+	def _load(self, kind, start):
+		# request one additional result to find out whether there are more
+		num=self._settings.get_int("search-results")
+		items=self._search[kind](self._keywords, start, start+num+1)
+		self._model.extend(kind, items[:num], len(items) > num)
+
+	def _load_more(self, load_more):
+		if not load_more.loading and (position:=self._model.get_load_more_position(load_more)) is not None:
+			load_more.loading=True
+			self._load(load_more.kind, position-self._model.get_section(position)[0])
+
+	def _on_activate(self, list_view, pos):
+		item=self._model.get_item(pos)
+		if isinstance(item, Artist):
+			self.emit("artist-selected", item)
+		elif isinstance(item, Album):
+			self.emit("album-selected", item)
+
+class ArtistIndex():
+	def __init__(self, model, collation_key):
+		self._model=model
+		self._collation_key=collation_key
+		self._positions=None
+		self._keys=None  # sorted (case-insensitive collation key, casefolded sort name, position)
+		self._model.connect("items-changed", self._on_items_changed)
+
+	def _build(self):
+		if self._positions is None:
+			self._positions={}
+			keys=[]
+			for position, artist in enumerate(self._model):
+				self._positions[(artist.name, artist.sortname)]=position
+				sortname=artist.sortname.casefold()
+				keys.append((self._collation_key(sortname), sortname, position))
+			self._keys=sorted(keys)
+
+	def lookup(self, artist):
+		self._build()
+		return self._positions.get((artist.name, artist.sortname))
+
+	def find_prefix(self, prefix):
+		self._build()
+		prefix=prefix.casefold()
+		index=bisect.bisect_left(self._keys, (locale.strxfrm(prefix),))
+		# the matches follow each other, but not necessarily in the order of the list
+		positions=[]
+		while index < len(self._keys) and self._keys[index][1].startswith(prefix):
+			positions.append(self._keys[index][2])
+			index+=1
+		return min(positions, default=None)
+
+	def _on_items_changed(self, *args):
+		self._positions=None
+		self._keys=None
 
 class ArtistList(Gtk.ListView):
 	show_selection=GObject.Property(type=bool, default=True)
 	__gsignals__={"artist-selected": (GObject.SignalFlags.RUN_FIRST, None, (Artist,)),
 		"clear": (GObject.SignalFlags.RUN_FIRST, None, ())}
+	_CHUNK_SIZE=200
 	def __init__(self, client):
 		super().__init__(tab_behavior=Gtk.ListTabBehavior.ITEM, single_click_activate=True, css_classes=["navigation-sidebar"])
 		self._client=client
+		self._collation_keys={}
+		self._stream=None
+		self._loader=None
 
 		# factory
-		def setup(factory, item):
-			label=Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END)
-			item.set_child(label)
-		def bind(factory, item):
-			label=item.get_child()
-			if name:=item.get_item().name:
-				label.set_text(name)
-			else:
-				label.set_markup(f'<i>{GLib.markup_escape_text(_("Unknown Artist"))}</i>')
-		factory=Gtk.SignalListItemFactory()
-		factory.connect("setup", setup)
-		factory.connect("bind", bind)
-		self.set_factory(factory)
+		self.set_factory(Gtk.BuilderListItemFactory.new_from_resource(None, "/de/wagnermartin/Plattenalbum/artist-list-item.ui"))
 
 		# model
 		self._selection_model=SelectionModel(Artist)
 		self.set_model(self._selection_model)
 		self.bind_property("show-selection", self._selection_model, "show-selection", GObject.BindingFlags.DEFAULT)
+		self._index=ArtistIndex(self._selection_model, self._collation_key)
+
+		# type-ahead
+		self._type_ahead=""
+		self._type_ahead_timeout=None
+
+		# event controller
+		key_controller=Gtk.EventControllerKey()
+		self.add_controller(key_controller)
 
 		# connect
 		self.connect("activate", self._on_activate)
+		key_controller.connect("key-pressed", self._on_key_pressed)
 		self._client.connect("disconnected", self._on_disconnected)
 		self._client.connect("connected", self._on_connected)
 		self._client.connect("updated-db", self._on_updated_db)
 
 	def select(self, artist):
-		for i, item in enumerate(self._selection_model):
-			if item == artist:
-				self._selection_model.select(i)
-				self.scroll_to(i, Gtk.ListScrollFlags.FOCUS, None)
-				self.emit("artist-selected", artist)
-				break
+		if (position:=self._index.lookup(artist)) is not None:
+			self._selection_model.select(position)
+			self.scroll_to(position, Gtk.ListScrollFlags.FOCUS, None)
+			self.emit("artist-selected", artist)
+
+	def unselect(self):
+		self._selection_model.unselect()
+
+	def _clear(self):
+		self._cancel()
+		self._selection_model.clear()
+		self.emit("clear")
+
+	def _load_chunk(self):
+		# mpd sorts bytewise, each chunk is inserted in collation order to show the first rows right away
+		try:
+			self._selection_model.insert_sorted(self._stream.read(self._CHUNK_SIZE), key=self._sort_key)
+			if self._stream.done:
+				self._stream=None
+				self._loader=None
+				if (song:=self._client.currentsong()):
+					self.select(song.get_album_artist())
+				return False
+			return True
+		except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+			self._cancel()
+			self._client.close_connection()
+			return False
+		except ValueError:  # Connection closed by user
+			self._cancel()
+			return False
+
+	def _cancel(self):
+		if self._loader is not None:
+			SCHEDULER.remove(self._loader)
+			self._loader=None
+		if self._stream is not None:
+			self._stream.cancel()
+			self._stream=None
 
-	def _clear(self):
-		self._selection_model.clear()
-		self.emit("clear")
+	def _collation_key(self, text):
+		if (collation_key:=self._collation_keys.get(text)) is None:
+			collation_key=self._collation_keys[text]=locale.strxfrm(text)
+		return collation_key
+
+	def _sort_key(self, artist):
+		return (self._collation_key(artist.sortname), artist.sortname, artist.name)
 
 	def _refresh(self):
-		self._clear()
-		self._selection_model.append(sorted(self._client.get_artists(), key=lambda item: locale.strxfrm(item.sortname)))
+		# replace only the runs of artists which differ between the old and the new sorted list
+		old=list(self._selection_model)
+		new=sorted(self._client.get_artists(), key=self._sort_key)
+		splices=[]
+		i=j=0
+		while i < len(old) or j < len(new):
+			if i < len(old) and j < len(new) and old[i] == new[j]:
+				i+=1
+				j+=1
+				continue
+			start=i
+			additions=[]
+			while i < len(old) or j < len(new):
+				if j == len(new) or (i < len(old) and self._sort_key(old[i]) < self._sort_key(new[j])):
+					i+=1
+				elif i == len(old) or self._sort_key(new[j]) < self._sort_key(old[i]):
+					additions.append(new[j])
+					j+=1
+				else:
+					break
+			splices.append((start, i-start, additions))
+		self._selection_model.apply(splices)
 
 	def _on_activate(self, widget, pos):
 		self._selection_model.select(pos)
 		self.emit("artist-selected", self._selection_model.get_item(pos))
 
+	def _on_type_ahead_timeout(self):
+		self._type_ahead=""
+		self._type_ahead_timeout=None
+		return False
+
+	def _on_key_pressed(self, controller, keyval, keycode, state):
+		if state & (Gdk.ModifierType.CONTROL_MASK|Gdk.ModifierType.ALT_MASK):
+			return False
+		if not (char:=chr(Gdk.keyval_to_unicode(keyval))).isprintable() or char.isspace():
+			return False
+		self._type_ahead+=char
+		if self._type_ahead_timeout is not None:
+			GLib.source_remove(self._type_ahead_timeout)
+		self._type_ahead_timeout=GLib.timeout_add(1000, self._on_type_ahead_timeout)
+		if (position:=self._index.find_prefix(self._type_ahead)) is not None:
+			self.scroll_to(position, Gtk.ListScrollFlags.FOCUS, None)
+		return True
+
 	def _on_disconnected(self, *args):
 		self._clear()
 
 	def _on_connected(self, client, database_is_empty):
 		if not database_is_empty:
-			self._refresh()
-			if (song:=self._client.currentsong()):
-				self.select(song.get_album_artist())
+			self._stream=self._client.stream_artists()
+			self._loader=SCHEDULER.add(self._load_chunk)
 
 	def _on_updated_db(self, client, database_is_empty):
+		self._cancel()
 		if database_is_empty:
 			self._clear()
 		else:
-			if (selected:=self._selection_model.get_selected()) is not None:
+			if (selected:=self._selection_model.get_selected()) is None:
+				artist=None
+			else:
 				artist=self._selection_model.get_item(selected)
-				self._refresh()
+			self._refresh()
+			self.emit("clear")
+			if artist is not None:
 				self.select(artist)
 
+class PagedAlbumModel(GObject.Object, Gio.ListModel):
+	"""
+	List model of album entries which creates album objects per page on demand.
+	Only recently used pages are kept, so covers of albums scrolled past can be freed.
+	"""
+	_PAGE_SIZE=100
+	def __init__(self):
+		super().__init__()
+		self._entries=[]
+		self._pages=LRUCache(8)
+
+	def set_entries(self, entries):
+		n=len(self._entries)
+		self._entries=entries
+		self._pages.clear()
+		self.items_changed(0, n, len(entries))
+
+	def clear(self):
+		self.set_entries([])
+
+	def do_get_item(self, position):
+		if position < len(self._entries):
+			page,offset=divmod(position, self._PAGE_SIZE)
+			if (albums:=self._pages.get(page)) is None:
+				entries=self._entries[page*self._PAGE_SIZE:(page+1)*self._PAGE_SIZE]
+				albums=[Album(Artist(albumartist, albumartistsort), name, date) for name, albumartist, albumartistsort, date in entries]
+				self._pages.put(page, albums)
+			return albums[offset]
+
+	def do_get_item_type(self):
+		return Album
+
+	def do_get_n_items(self):
+		return len(self._entries)
+
 class AlbumRow(Gtk.Box):
-	def __init__(self, client):
+	def __init__(self, client, owner):
 		super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=3)
 		self._client=client
+		self._owner=owner  # tag of the prefetch requests
+		self.album=None
 		self._cover=AlbumCover()
 		self._title=Gtk.Label(single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, margin_top=3)
 		self._date=Gtk.Label(single_line_mode=True, css_classes=["dimmed", "caption"])
@@ -1519,43 +2963,78 @@ class AlbumRow(Gtk.Box):
 		self.append(self._title)
 		self.append(self._date)
 
+		# prefetch on hover
+		motion_controller=Gtk.EventControllerMotion()
+		motion_controller.connect("enter", self._on_enter)
+		motion_controller.connect("leave", self._on_leave)
+		self.add_controller(motion_controller)
+
 	def set_album(self, album):
+		self.album=album
 		if album.name:
 			self._title.set_text(album.name)
-			self._cover.set_alternative_text(_("Album cover of {album}").format(album=album.name))
 		else:
-			self._title.set_markup(f'<i>{GLib.markup_escape_text(_("Unknown Album"))}</i>')
-			self._cover.set_alternative_text(_("Album cover of an unknown album"))
+			self._title.set_markup(UNKNOWN_ALBUM_MARKUP)
+		self._cover.set_alternative_text(album.get_alternative_text())
 		self._date.set_text(album.date)
 		if album.cover is None:
-			album.cover=self._client.get_cover(album)
-		self._cover.set_paintable(album.cover)
+			self._cover.set_paintable(FALLBACK_COVER)
+			self._client.prefetcher.load_cover(album, self._on_cover)
+		else:
+			self._cover.set_paintable(album.cover)
+
+	def unset_album(self):
+		if self.album is not None:
+			self._client.prefetcher.cancel(self.album)
+			self._client.prefetcher.cancel_cover(self.album)
+			self.album=None
+
+	def _on_cover(self, album):
+		if album is self.album:
+			self._cover.set_paintable(album.cover)
+
+	def _on_enter(self, *args):
+		if self.album is not None:
+			self._client.prefetcher.add(self.album, owner=self._owner)
+
+	def _on_leave(self, *args):
+		if self.album is not None:
+			self._client.prefetcher.cancel(self.album)
 
 class AlbumsPage(Adw.NavigationPage):
 	__gsignals__={"album-selected": (GObject.SignalFlags.RUN_FIRST, None, (Album,))}
+	_CHUNK_SIZE=50
 	def __init__(self, client, settings):
 		super().__init__(title=_("Albums"), tag="album_list")
 		self._settings=settings
 		self._client=client
 		self._artist=None
+		self._stream=None
+		self._loader=None
 
 		# grid view
 		self.grid_view=Gtk.GridView(tab_behavior=Gtk.ListTabBehavior.ITEM, single_click_activate=True, vexpand=True, max_columns=2)
 		self.grid_view.add_css_class("navigation-sidebar")
 		self.grid_view.add_css_class("albums-view")
 		self._selection_model=SelectionModel(Album)
+		self._paged_model=PagedAlbumModel()
+		self._paged_selection_model=Gtk.NoSelection(model=self._paged_model)
 		self.grid_view.set_model(self._selection_model)
 
 		# factory
 		def setup(factory, item):
-			row=AlbumRow(self._client)
+			row=AlbumRow(self._client, self)
 			item.set_child(row)
 		def bind(factory, item):
 			row=item.get_child()
 			row.set_album(item.get_item())
+		def unbind(factory, item):
+			row=item.get_child()
+			row.unset_album()
 		factory=Gtk.SignalListItemFactory()
 		factory.connect("setup", setup)
 		factory.connect("bind", bind)
+		factory.connect("unbind", unbind)
 		self.grid_view.set_factory(factory)
 
 		# breakpoint bin
@@ -1578,6 +3057,8 @@ class AlbumsPage(Adw.NavigationPage):
 		# connect
 		self.grid_view.connect("activate", self._on_activate)
 		self._client.connect("disconnected", self._on_disconnected)
+		self.connect("map", self._on_map)
+		self.connect("unmap", self._on_unmap)
 
 		# packing
 		toolbar_view=Adw.ToolbarView(content=self._stack)
@@ -1585,39 +3066,126 @@ class AlbumsPage(Adw.NavigationPage):
 		self.set_child(toolbar_view)
 
 	def clear(self, *args):
+		self._cancel()
 		self._selection_model.clear()
+		self._paged_model.clear()
+		self.grid_view.set_model(self._selection_model)
 		self.set_title(_("Albums"))
 		self._stack.set_visible_child_name("status-page")
 		self._artist=None
 
 	def display(self, artist):
 		if artist != self._artist:
+			self._cancel()
 			self._settings.set_property("cursor-watch", True)
 			self._artist=artist
 			self._selection_model.clear()
+			self._paged_model.clear()
+			self.grid_view.set_model(self._selection_model)
 			self.set_title(artist.name)
 			self._stack.set_visible_child_name("albums")
-			# ensure list is empty
-			main=GLib.main_context_default()
-			while main.pending():
-				main.iteration()
 			self.update_property([Gtk.AccessibleProperty.LABEL], [_("Albums of {artist}").format(artist=artist.name)])
-			self._selection_model.append(sorted(self._client.get_albums(artist), key=lambda item: item.date))
+			self._stream=self._client.get_albums(artist)
+			self._loader=SCHEDULER.add(self._load_chunk)
+
+	def display_all(self):
+		self.display_entries(_("All Albums"), self._client.get_album_entries())
+
+	def display_entries(self, title, entries):
+		self._cancel()
+		self._artist=None
+		self._selection_model.clear()
+		self.set_title(title)
+		self._stack.set_visible_child_name("albums")
+		self.update_property([Gtk.AccessibleProperty.LABEL], [title])
+		collation_keys={}
+		def sort_key(entry):
+			name,albumartist,albumartistsort,date=entry
+			if (collation_key:=collation_keys.get(albumartistsort)) is None:
+				collation_key=collation_keys[albumartistsort]=locale.strxfrm(albumartistsort)
+			return (collation_key, albumartistsort, albumartist, date, name)
+		self._paged_model.set_entries(sorted(entries, key=sort_key))
+		self.grid_view.set_model(self._paged_selection_model)
+		if self._paged_model.get_n_items():
+			self.grid_view.scroll_to(0, Gtk.ListScrollFlags.NONE, None)
+
+	def _load_chunk(self):
+		try:
+			self._selection_model.insert_sorted(self._stream.read(self._CHUNK_SIZE), key=lambda item: item.date)
+		except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+			self._finish_loading()
+			self._client.close_connection()
+			return False
+		except ValueError:  # Connection closed by user
+			self._finish_loading()
+			return False
+		if self._stream.done:
+			self._finish_loading()
+			return False
+		return True
+
+	def _finish_loading(self):
+		self._stream=None
+		self._loader=None
+		self._settings.set_property("cursor-watch", False)
+
+	def _cancel(self):
+		self._client.prefetcher.cancel_all(owner=self)
+		if self._loader is not None:
+			SCHEDULER.remove(self._loader)
+			self._loader=None
 			self._settings.set_property("cursor-watch", False)
+		if self._stream is not None:
+			self._stream.cancel()
+			self._stream=None
 
 	def _on_activate(self, widget, pos):
-		self.emit("album-selected", self._selection_model.get_item(pos))
+		self.emit("album-selected", self.grid_view.get_model().get_item(pos))
+
+	def _on_map(self, *args):
+		self._focus_handler=self.get_root().connect("notify::focus-widget", self._on_focus_widget)
+
+	def _on_unmap(self, *args):
+		self.get_root().disconnect(self._focus_handler)
+		self._client.prefetcher.cancel_all(owner=self)
+
+	def _on_focus_widget(self, window, param):
+		# grid items are focused by keyboard navigation, their child is the album row
+		if (widget:=window.get_focus()) is not None and isinstance(row:=widget.get_first_child(), AlbumRow) and row.album is not None:
+			self._client.prefetcher.add(row.album, owner=self)
 
 	def _on_disconnected(self, *args):
+		self._cancel()
 		self._stack.set_visible_child_name("albums")
 
 class AlbumPage(Adw.NavigationPage):
 	def __init__(self, client, album):
 		super().__init__()
+		self._album=album
+		self._songs,self._duration,self._cover=client.get_album_contents(album)
+
+		# factories
+		def setup(factory, item):
+			item.set_child(SongRow(show_track=True, hide_artist=album.artist.name))
+		def bind(factory, item):
+			row=item.get_child()
+			row.set_song(item.get_item())
+			row.set_property("position", item.get_position())
+		def unbind(factory, item):
+			row=item.get_child()
+			row.unset_song()
+			row.set_property("position", -1)
+		factory=Gtk.SignalListItemFactory()
+		factory.connect("setup", setup)
+		factory.connect("bind", bind)
+		factory.connect("unbind", unbind)
+		header_factory=Gtk.SignalListItemFactory()
+		header_factory.connect("setup", lambda factory, header: header.set_child(self._create_header()))
 
-		# songs list
-		song_list=SongList(client)
-		song_list.add_css_class("boxed-list")
+		# song list
+		model=SelectionModel(Song, multiple=True)
+		model.set_property("show-selection", False)
+		song_list=SongListView(client, model=model, factory=factory, header_factory=header_factory)
 
 		# buttons
 		self.play_button=Gtk.Button(icon_name="media-playback-start-symbolic", tooltip_text=_("Play"))
@@ -1630,11 +3198,24 @@ class AlbumPage(Adw.NavigationPage):
 		header_bar.pack_end(self.play_button)
 		header_bar.pack_end(append_button)
 
+		# packing
+		toolbar_view=Adw.ToolbarView(content=Gtk.ScrolledWindow(child=Adw.ClampScrollable(child=song_list)))
+		toolbar_view.add_top_bar(header_bar)
+		self.set_child(toolbar_view)
+
+		# populate
+		if album.name:
+			self.set_title(album.name)
+		else:
+			self.set_title(_("Unknown Album"))
+		model.append(self._songs)
+
+	def _create_header(self):
 		# labels
-		suptitle=Gtk.Label(single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, css_classes=["dimmed", "caption"])
-		title=Gtk.Label(wrap=True, justify=Gtk.Justification.CENTER, css_classes=["title-4"])
-		subtitle=Gtk.Label(single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, visible=bool(album.date))
-		length=Gtk.Label(single_line_mode=True, css_classes=["numeric", "dimmed", "caption"])
+		suptitle=Gtk.Label(label=self._album.artist.name, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, css_classes=["dimmed", "caption"])
+		title=Gtk.Label(label=self.get_title(), wrap=True, justify=Gtk.Justification.CENTER, css_classes=["title-4"])
+		subtitle=Gtk.Label(label=self._album.date, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, visible=bool(self._album.date))
+		length=Gtk.Label(label=str(self._duration), single_line_mode=True, css_classes=["numeric", "dimmed", "caption"])
 
 		# label box
 		label_box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=3, margin_top=9, margin_bottom=18)
@@ -1645,30 +3226,266 @@ class AlbumPage(Adw.NavigationPage):
 
 		# cover
 		cover=AlbumCover()
+		cover.set_paintable(self._cover)
 
 		# packing
-		box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL, margin_start=12, margin_end=12, margin_top=6, margin_bottom=24)
+		box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
 		box.append(Adw.Clamp(child=cover, maximum_size=200))
 		box.append(label_box)
-		box.append(Adw.Clamp(child=song_list))
-		toolbar_view=Adw.ToolbarView(content=Gtk.ScrolledWindow(child=box))
+		return box
+
+class DirectoryModel(Gio.ListStore):
+	_CHUNK_SIZE=200
+	def __init__(self, client, directory):
+		super().__init__(item_type=GObject.Object)
+		self._client=client
+		self._directory=directory
+		self._stream=None
+		self._loader=None
+
+	def load(self):
+		if self._stream is None:
+			self._stream=self._client.list_directory(self._directory)
+			self._loader=SCHEDULER.add(self._load_chunk)
+
+	def cancel(self):
+		if self._loader is not None:
+			SCHEDULER.remove(self._loader)
+			self._loader=None
+			self._stream.cancel()
+
+	def _load_chunk(self):
+		try:
+			self.splice(self.get_n_items(), 0, self._stream.read(self._CHUNK_SIZE))
+		except (BrokenPipeError, ConnectionResetError, CommandError):  # Server offline or connection lost
+			self.cancel()
+			self._client.close_connection()
+			return False
+		except ValueError:  # Connection closed by user
+			self.cancel()
+			return False
+		if self._stream.done:
+			self._loader=None
+			return False
+		return True
+
+class FoldersPage(Adw.NavigationPage):
+	def __init__(self, client):
+		super().__init__(title=_("Folders"), tag="folders")
+		self._client=client
+		self._root=None
+		self._children=weakref.WeakValueDictionary()  # models of expanded subdirectories by path
+
+		# factory
+		def setup(factory, item):
+			box=Gtk.Box(spacing=6)
+			box.append(Gtk.Image())
+			box.append(Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END))
+			item.set_child(Gtk.TreeExpander(child=box))
+		def bind(factory, item):
+			expander=item.get_child()
+			row=item.get_item()
+			expander.set_list_row(row)
+			icon=expander.get_child().get_first_child()
+			label=icon.get_next_sibling()
+			if isinstance(entry:=row.get_item(), Directory):
+				icon.set_from_icon_name("folder-symbolic")
+				label.set_text(entry.name)
+			else:
+				icon.set_from_icon_name("audio-x-generic-symbolic")
+				label.set_text(GLib.path_get_basename(entry["file"]))
+			expander.handler=row.connect("notify::expanded", self._on_expanded)
+			self._on_expanded(row)
+		def unbind(factory, item):
+			item.get_item().disconnect(item.get_child().handler)
+		factory=Gtk.SignalListItemFactory()
+		factory.connect("setup", setup)
+		factory.connect("bind", bind)
+		factory.connect("unbind", unbind)
+
+		# list view
+		self._list_view=Gtk.ListView(factory=factory, tab_behavior=Gtk.ListTabBehavior.ITEM)
+		self._list_view.add_css_class("navigation-sidebar")
+
+		# buttons
+		play_button=Gtk.Button(icon_name="media-playback-start-symbolic", tooltip_text=_("Play"))
+		append_button=Gtk.Button(icon_name="list-add-symbolic", tooltip_text=_("Append"))
+
+		# connect
+		self._list_view.connect("activate", self._on_activate)
+		play_button.connect("clicked", self._on_play_clicked)
+		append_button.connect("clicked", self._on_append_clicked)
+		self._client.connect("disconnected", self._reset)
+		self._client.connect("updated-db", self._reset)
+
+		# packing
+		header_bar=Adw.HeaderBar()
+		header_bar.pack_end(append_button)
+		header_bar.pack_end(play_button)
+		toolbar_view=Adw.ToolbarView(content=Gtk.ScrolledWindow(child=self._list_view))
 		toolbar_view.add_top_bar(header_bar)
 		self.set_child(toolbar_view)
 
-		# populate
-		if album.name:
-			self.set_title(album.name)
-			title.set_text(album.name)
+	def display(self):
+		if self._root is None:
+			self._root=DirectoryModel(self._client, Directory(""))
+			tree_model=Gtk.TreeListModel.new(self._root, False, False, self._create_model)
+			self._list_view.set_model(Gtk.SingleSelection(model=tree_model, autoselect=False))
+			self._root.load()
+
+	def _create_model(self, item):
+		if isinstance(item, Directory):
+			model=DirectoryModel(self._client, item)
+			self._children[item.path]=model
+			return model
+
+	def _get_selected(self):
+		if (row:=self._list_view.get_model().get_selected_item()) is not None:
+			return row.get_item()
+
+	def _reset(self, *args):
+		if self._root is not None:
+			self._root.cancel()
+			for model in list(self._children.values()):
+				model.cancel()
+			self._children.clear()
+			self._root=None
+			self._list_view.set_model(None)
+
+	def _on_expanded(self, row, *args):
+		if row.get_expanded():
+			row.get_children().load()
+		elif isinstance(entry:=row.get_item(), Directory) and (model:=self._children.pop(entry.path, None)) is not None:
+			model.cancel()  # the tree drops the model of a collapsed row
+
+	def _on_activate(self, list_view, pos):
+		row=list_view.get_model().get_item(pos)
+		if isinstance(row.get_item(), Directory):
+			row.set_expanded(not row.get_expanded())
 		else:
-			self.set_title(_("Unknown Album"))
-			title.set_text(_("Unknown Album"))
-		suptitle.set_text(album.artist.name)
-		subtitle.set_text(album.date)
-		length.set_text(str(client.get_duration(album)))
-		cover.set_paintable(client.get_cover(album))
-		for song in client.get_songs(album):
-			row=SongActionRow(song, hide_artist=album.artist.name)
-			song_list.append(row)
+			self._client.play_song(row.get_item())
+
+	def _on_play_clicked(self, *args):
+		if isinstance(entry:=self._get_selected(), Directory):
+			self._client.play_directory(entry)
+		elif entry is not None:
+			self._client.play_song(entry)
+
+	def _on_append_clicked(self, *args):
+		if isinstance(entry:=self._get_selected(), Directory):
+			self._client.append_directory(entry)
+		elif entry is not None:
+			self._client.append_song(entry)
+
+class FacetValue(GObject.Object):
+	def __init__(self, facet, value, count):
+		GObject.Object.__init__(self)
+		self.facet=facet
+		self.value=value
+		self.count=count
+
+class FacetsPage(Adw.NavigationPage):
+	__gsignals__={"show-albums": (GObject.SignalFlags.RUN_FIRST, None, (str,))}
+	def __init__(self, client):
+		super().__init__(title=_("Browse by Tag"), tag="facets")
+		self._client=client
+		self._index=None
+		self._filters={}
+		self._stores={}
+
+		# factory
+		def setup(factory, item):
+			box=Gtk.Box(spacing=12)
+			box.append(Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, hexpand=True))
+			box.append(Gtk.Label(css_classes=["dimmed", "numeric"]))
+			item.set_child(box)
+		def bind(factory, item):
+			label=item.get_child().get_first_child()
+			label.set_text(item.get_item().value)
+			label.get_next_sibling().set_text(str(item.get_item().count))
+		factory=Gtk.SignalListItemFactory()
+		factory.connect("setup", setup)
+		factory.connect("bind", bind)
+
+		# stack
+		self._stack=Adw.ViewStack(vhomogeneous=False)
+		for facet, title in (("genre", _("Genre")), ("composer", _("Composer")), ("decade", _("Decade")), ("year", _("Year"))):
+			self._stores[facet]=Gio.ListStore(item_type=FacetValue)
+			list_view=Gtk.ListView(model=Gtk.NoSelection(model=self._stores[facet]), factory=factory,
+				tab_behavior=Gtk.ListTabBehavior.ITEM, single_click_activate=True, css_classes=["navigation-sidebar"])
+			list_view.connect("activate", self._on_activate)
+			self._stack.add_titled(Gtk.ScrolledWindow(child=list_view), facet, title)
+
+		# view switcher
+		view_switcher=Adw.InlineViewSwitcher(stack=self._stack, display_mode=Adw.InlineViewSwitcherDisplayMode.LABELS)
+		view_switcher.add_css_class("flat")
+
+		# filter bar
+		self._filter_box=Gtk.Box(spacing=6, hexpand=True)
+		self._show_albums_button=Gtk.Button(label=_("Show _Albums"), use_underline=True, css_classes=["suggested-action"], sensitive=False)
+		filter_bar=Gtk.Box(spacing=6, margin_start=6, margin_end=6, margin_top=6, margin_bottom=6)
+		filter_bar.append(Gtk.ScrolledWindow(child=self._filter_box, vscrollbar_policy=Gtk.PolicyType.NEVER, hexpand=True))
+		filter_bar.append(self._show_albums_button)
+
+		# connect
+		self._stack.connect("notify::visible-child-name", lambda *args: self._refresh())
+		self._show_albums_button.connect("clicked", self._on_show_albums_clicked)
+		self._client.connect("disconnected", self._reset)
+		self._client.connect("updated-db", self._reset)
+
+		# packing
+		header_bar=Adw.HeaderBar(title_widget=view_switcher)
+		toolbar_view=Adw.ToolbarView(content=self._stack)
+		toolbar_view.add_top_bar(header_bar)
+		toolbar_view.add_top_bar(filter_bar)
+		self.set_child(toolbar_view)
+
+	def display(self):
+		if self._index is None:
+			self._index=self._client.get_facets()
+			self._show_albums_button.set_sensitive(True)
+			self._refresh()
+
+	def get_albums(self):
+		return self._index.get_albums(self._filters.items())
+
+	def _refresh(self):
+		if self._index is not None:
+			facet=self._stack.get_visible_child_name()
+			filters=[(key, value) for key, value in self._filters.items() if key != facet]
+			store=self._stores[facet]
+			store.splice(0, store.get_n_items(), [FacetValue(facet, value, count) for value, count in self._index.get_counts(facet, filters)])
+		while (button:=self._filter_box.get_first_child()) is not None:
+			self._filter_box.remove(button)
+		for facet, value in self._filters.items():
+			button=Gtk.Button(child=Adw.ButtonContent(icon_name="window-close-symbolic", label=value), tooltip_text=_("Remove Filter"))
+			button.connect("clicked", self._on_remove_filter, facet)
+			self._filter_box.append(button)
+
+	def _reset(self, *args):
+		self._index=None
+		self._show_albums_button.set_sensitive(False)
+		self._filters.clear()
+		for store in self._stores.values():
+			store.remove_all()
+		self._refresh()
+
+	def _on_activate(self, list_view, pos):
+		item=list_view.get_model().get_item(pos)
+		self._filters[item.facet]=item.value
+		self._refresh()
+
+	def _on_remove_filter(self, button, facet):
+		del self._filters[facet]
+		self._refresh()
+
+	def _on_show_albums_clicked(self, *args):
+		if self._index is None:  # the page is reloaded when it is displayed again
+			return
+		if self._filters:
+			self.emit("show-albums", " / ".join(self._filters.values()))
+		else:
+			self.emit("show-albums", _("All Albums"))
 
 class MainMenuButton(Gtk.MenuButton):
 	def __init__(self):
@@ -1690,7 +3507,7 @@ class Browser(Gtk.Stack):
 		self._client=client
 
 		# search
-		self._search_view=SearchView(client)
+		self._search_view=SearchView(client, settings)
 		self.search_entry=Gtk.SearchEntry(placeholder_text=_("Search collection"), max_width_chars=25)
 		self.search_entry.update_property([Gtk.AccessibleProperty.LABEL], [_("Search collection")])
 		search_toolbar_view=Adw.ToolbarView(content=self._search_view)
@@ -1705,6 +3522,11 @@ class Browser(Gtk.Stack):
 		search_button.connect("clicked", lambda *args: self.search())
 		artist_header_bar.pack_start(search_button)
 		artist_header_bar.pack_end(MainMenuButton())
+		browse_menu=Gio.Menu()
+		browse_menu.append(_("_All Albums"), "browser.all-albums")
+		browse_menu.append(_("_Folders"), "browser.folders")
+		browse_menu.append(_("Browse by _Tag"), "browser.facets")
+		artist_header_bar.pack_end(Gtk.MenuButton(icon_name="view-grid-symbolic", tooltip_text=_("Browse"), menu_model=browse_menu))
 		artist_toolbar_view=Adw.ToolbarView(content=Gtk.ScrolledWindow(child=self._artist_list))
 		artist_toolbar_view.add_top_bar(artist_header_bar)
 		artist_page=Adw.NavigationPage(child=artist_toolbar_view, title=_("Artists"), tag="artists")
@@ -1712,6 +3534,12 @@ class Browser(Gtk.Stack):
 		# album list
 		self._albums_page=AlbumsPage(client, settings)
 
+		# folders
+		self._folders_page=FoldersPage(client)
+
+		# facets
+		self._facets_page=FacetsPage(client)
+
 		# navigation view
 		self._album_navigation_view=Adw.NavigationView()
 		self._album_navigation_view.add(self._albums_page)
@@ -1736,13 +3564,29 @@ class Browser(Gtk.Stack):
 		status_page_toolbar_view=Adw.ToolbarView(content=status_page)
 		status_page_toolbar_view.add_top_bar(status_page_header_bar)
 
+		# action group
+		action_group=Gio.SimpleActionGroup()
+		action=Gio.SimpleAction.new("all-albums", None)
+		action.connect("activate", self._on_all_albums)
+		action_group.add_action(action)
+		action=Gio.SimpleAction.new("folders", None)
+		action.connect("activate", self._on_folders)
+		action_group.add_action(action)
+		action=Gio.SimpleAction.new("facets", None)
+		action.connect("activate", self._on_facets)
+		action_group.add_action(action)
+		self.insert_action_group("browser", action_group)
+
 		# navigation view
 		self._navigation_view=Adw.NavigationView()
 		self._navigation_view.add(Adw.NavigationPage(child=breakpoint_bin, title=_("Collection"), tag="collection"))
 		self._navigation_view.add(Adw.NavigationPage(child=search_toolbar_view, title=_("Search"), tag="search"))
+		self._navigation_view.add(self._folders_page)
+		self._navigation_view.add(self._facets_page)
 
 		# connect
 		self._albums_page.connect("album-selected", self._on_album_selected)
+		self._facets_page.connect("show-albums", self._on_show_facet_albums)
 		self._artist_list.connect("artist-selected", self._on_artist_selected)
 		self._artist_list.connect("clear", self._albums_page.clear)
 		self._search_view.connect("artist-selected", self._on_search_artist_selected)
@@ -1778,6 +3622,27 @@ class Browser(Gtk.Stack):
 		self._album_navigation_view.replace_with_tags(["album_list"])
 		self._albums_page.display(artist)
 
+	def _on_all_albums(self, *args):
+		self._artist_list.unselect()
+		self._navigation_split_view.set_show_content(True)
+		self._album_navigation_view.replace_with_tags(["album_list"])
+		self._albums_page.display_all()
+
+	def _on_folders(self, *args):
+		self._folders_page.display()
+		self._navigation_view.push_by_tag("folders")
+
+	def _on_facets(self, *args):
+		self._facets_page.display()
+		self._navigation_view.push_by_tag("facets")
+
+	def _on_show_facet_albums(self, facets_page, title):
+		self._navigation_view.pop_to_tag("collection")
+		self._artist_list.unselect()
+		self._navigation_split_view.set_show_content(True)
+		self._album_navigation_view.replace_with_tags(["album_list"])
+		self._albums_page.display_entries(title, facets_page.get_albums())
+
 	def _on_album_selected(self, widget, album):
 		album_page=AlbumPage(self._client, album)
 		self._album_navigation_view.push(album_page)
@@ -1813,17 +3678,31 @@ class Browser(Gtk.Stack):
 # playlist #
 ############
 
+class QueueRow(Gtk.Box):
+	# built from a list item template, the labels are bound to the properties of the song
+	__gtype_name__="QueueRow"
+	_position=-1
+	@GObject.Property(type=int, default=-1)
+	def position(self):
+		return self._position
+	@position.setter
+	def position(self, position):
+		self._position=position
+		if (view:=self.get_ancestor(PlaylistView)) is not None:
+			view.mark_row(self)
+
 class PlaylistMenu(Gtk.PopoverMenu):
 	def __init__(self, client):
 		super().__init__(has_arrow=False, halign=Gtk.Align.START)
 		self.update_property([Gtk.AccessibleProperty.LABEL], [_("Context menu")])
 		self._client=client
 		self._song=None
+		self._positions=[]
 
 		# action group
 		action_group=Gio.SimpleActionGroup()
 		self._remove_action=Gio.SimpleAction.new("delete", None)
-		self._remove_action.connect("activate", lambda *args: self._client.delete_song(self._song))
+		self._remove_action.connect("activate", lambda *args: self._client.delete_positions(self._positions))
 		action_group.add_action(self._remove_action)
 		self._show_album_action=Gio.SimpleAction.new("show-album", None)
 		self._show_album_action.connect("activate", lambda *args: self._client.show_album(self._song))
@@ -1845,8 +3724,9 @@ class PlaylistMenu(Gtk.PopoverMenu):
 		menu.append_section(None, mpd_section)
 		self.set_menu_model(menu)
 
-	def open(self, song, x, y):
+	def open(self, song, x, y, positions=()):
 		self._song=song
+		self._positions=positions
 		rect=Gdk.Rectangle()
 		rect.x,rect.y=x,y
 		self.set_pointing_to(rect)
@@ -1856,40 +3736,10 @@ class PlaylistMenu(Gtk.PopoverMenu):
 			self._show_file_action.set_enabled(False)
 		else:
 			self._remove_action.set_enabled(True)
-			self._show_album_action.set_enabled(self._client.can_show_album(self._song))
-			self._show_file_action.set_enabled(self._client.can_show_file(self._song))
+			self._show_album_action.set_enabled(len(positions) == 1 and self._client.can_show_album(self._song))
+			self._show_file_action.set_enabled(len(positions) == 1 and self._client.can_show_file(self._song))
 		self.popup()
 
-class SongRow(Gtk.Box):
-	position=GObject.Property(type=int, default=-1)
-	def __init__(self, show_track=True, **kwargs):
-		# can_target=False is needed to use Gtk.Widget.pick() in Gtk.ListView
-		super().__init__(can_target=False, **kwargs)
-
-		# labels
-		self._title=Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END)
-		self._subtitle=Gtk.Label(xalign=0, single_line_mode=True, ellipsize=Pango.EllipsizeMode.END, css_classes=["dimmed", "caption"])
-		self._length=Gtk.Label(xalign=1, single_line_mode=True, css_classes=["numeric", "dimmed"])
-
-		# packing
-		box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL, valign=Gtk.Align.CENTER, hexpand=True)
-		box.append(self._title)
-		box.append(self._subtitle)
-		self.append(box)
-		self.append(self._length)
-
-	def set_song(self, song):
-		subtitle=str(song["artist"])
-		self._title.set_text(song["title"][0])
-		self._subtitle.set_visible(bool(subtitle))
-		self._subtitle.set_text(subtitle)
-		self._length.set_text(str(song["duration"]))
-
-	def unset_song(self):
-		self._title.set_text("")
-		self._subtitle.set_text("")
-		self._length.set_text("")
-
 class PlaylistView(Gtk.ListView):
 	def __init__(self, client):
 		super().__init__(tab_behavior=Gtk.ListTabBehavior.ITEM)
@@ -1898,30 +3748,15 @@ class PlaylistView(Gtk.ListView):
 		self._activate_on_release=False
 		self._autoscroll=True
 		self._highlighted_widget=None
+		self._marks={"playing": None, "found": None}  # css classes of rows by position
 		self.add_css_class("playlist")
 		self.add_css_class("no-drop-highlight")
 
 		# factory
-		def setup(factory, item):
-			item.set_child(SongRow())
-		def bind(factory, item):
-			row=item.get_child()
-			song=item.get_item()
-			row.set_song(song)
-			row.set_property("position", item.get_position())
-		def unbind(factory, item):
-			row=item.get_child()
-			song=item.get_item()
-			row.unset_song()
-			row.set_property("position", -1)
-		factory=Gtk.SignalListItemFactory()
-		factory.connect("setup", setup)
-		factory.connect("bind", bind)
-		factory.connect("unbind", unbind)
-		self.set_factory(factory)
+		self.set_factory(Gtk.BuilderListItemFactory.new_from_resource(None, "/de/wagnermartin/Plattenalbum/song-list-item.ui"))
 
 		# model
-		self._selection_model=SelectionModel(Song)
+		self._selection_model=PlaylistModel(client)
 		self.set_model(self._selection_model)
 
 		# menu
@@ -1985,16 +3820,50 @@ class PlaylistView(Gtk.ListView):
 	def _get_song(self, row):
 		return self._selection_model.get_item(row.get_property("position"))
 
+	def _get_positions(self, position):
+		# actions on a selected song apply to the whole selection
+		if position in (positions:=self._selection_model.get_selected_positions()):
+			return positions
+		return [position]
+
 	def _clear(self, *args):
 		self._menu.popdown()
 		self._playlist_version=None
 		self._selection_model.clear()
+		self._mark("playing", None)
+		self._mark("found", None)
 
 	def _refresh_selection(self, song):
 		if song is None:
 			self._selection_model.unselect()
 		else:
 			self._selection_model.select(int(song))
+		self._mark("playing", self._selection_model.get_selected())
+
+	def _mark(self, css_class, position):
+		if position != self._marks[css_class]:
+			self._marks[css_class]=position
+			child=self.get_first_child()
+			while child is not None:
+				if isinstance(row:=child.get_first_child(), QueueRow):
+					self.mark_row(row)
+				child=child.get_next_sibling()
+
+	def mark_row(self, row):
+		position=row.get_property("position")
+		for css_class, marked in self._marks.items():
+			if position == marked:
+				row.get_parent().add_css_class(css_class)
+			else:
+				row.get_parent().remove_css_class(css_class)
+
+	def highlight(self, position):
+		# independent of the selection and the keyboard focus
+		self._mark("found", position)
+
+	def show_position(self, position):
+		self.highlight(position)
+		self.scroll_to(position, Gtk.ListScrollFlags.NONE, None)
 
 	def _on_button_pressed(self, controller, n_press, x, y):
 		if (position:=self._get_position(x,y)) is None:
@@ -2002,11 +3871,14 @@ class PlaylistView(Gtk.ListView):
 				self._menu.open(None, x, y)
 		else:
 			if controller.get_current_button() == 1 and n_press == 1:
-				self._activate_on_release=True
+				# modified clicks are handled by the list view to change the selection
+				if not controller.get_current_event_state() & (Gdk.ModifierType.CONTROL_MASK|Gdk.ModifierType.SHIFT_MASK):
+					self._selection_model.unselect_all()
+					self._activate_on_release=True
 			elif controller.get_current_button() == 2 and n_press == 1:
-				self._client.delete_song(self._selection_model.get_item(position))
+				self._client.delete_positions(self._get_positions(position))
 			elif controller.get_current_button() == 3 and n_press == 1:
-				self._menu.open(self._selection_model.get_item(position), x, y)
+				self._menu.open(self._selection_model.get_item(position), x, y, self._get_positions(position))
 
 	def _on_button_stopped(self, controller):
 		self._activate_on_release=False
@@ -2021,7 +3893,7 @@ class PlaylistView(Gtk.ListView):
 		if (position:=self._get_position(x,y)) is None:
 			self._menu.open(None, None, x, y)
 		else:
-			self._menu.open(self._selection_model.get_item(position), x, y)
+			self._menu.open(self._selection_model.get_item(position), x, y, self._get_positions(position))
 
 	def _on_activate(self, listview, pos):
 		self._autoscroll=False
@@ -2029,9 +3901,10 @@ class PlaylistView(Gtk.ListView):
 
 	def _on_playlist_changed(self, client, version, length, songpos):
 		self._menu.popdown()
-		for song in self._client.get_playlist_changes(self._playlist_version):
-			self._selection_model.set(int(song["pos"]), song)
-		self._selection_model.clear(length)
+		if self._playlist_version is None:
+			self._selection_model.reset(length)
+		else:
+			self._selection_model.update(self._client.get_playlist_changes(self._playlist_version), length)
 		self._refresh_selection(songpos)
 		if self._playlist_version is None and (selected:=self._selection_model.get_selected()) is not None:  # always scroll to song on startup
 			self.scroll_to(selected, Gtk.ListScrollFlags.FOCUS, None)
@@ -2051,14 +3924,15 @@ class PlaylistView(Gtk.ListView):
 
 	def _on_menu(self, action, state):
 		row=self._get_focus_row()
+		positions=self._get_positions(row.get_property("position"))
 		computed_point,point=row.compute_point(self, Graphene.Point.zero())
 		if computed_point:
-			self._menu.open(self._get_song(row), point.x, point.y)
+			self._menu.open(self._get_song(row), point.x, point.y, positions)
 		else:
-			self._menu.open(self._get_song(row), 0, 0)
+			self._menu.open(self._get_song(row), 0, 0, positions)
 
 	def _on_delete(self, action, state):
-		self._client.delete_song(self._get_song(self._get_focus_row()))
+		self._client.delete_positions(self._get_positions(self._get_focus_row().get_property("position")))
 
 	def _on_drag_prepare(self, drag_source, x, y):
 		if (position:=self._get_position(x,y)) is not None:
@@ -2072,7 +3946,13 @@ class PlaylistView(Gtk.ListView):
 				position=self._selection_model.get_n_items()-1
 			else:
 				position=item.get_first_child().get_property("position")
-			if value != position:
+			if len(positions:=self._get_positions(value)) > 1:
+				# the dragged block is placed like a single song
+				if position > value:
+					position-=sum(1 for selected in positions if selected < position)-1
+				self._client.move_positions(positions, position)
+				return True
+			elif value != position:
 				self._client.move(value, position)
 				return True
 		elif isinstance(value, Song):
@@ -2108,7 +3988,7 @@ class PlaylistWindow(Gtk.Stack):
 		self._client=client
 
 		# widgets
-		playlist_view=PlaylistView(self._client)
+		self.playlist_view=PlaylistView(self._client)
 		status_page=Adw.StatusPage(icon_name="view-playlist-symbolic", title=_("Playlist is Empty"))
 		status_page.add_css_class("compact")
 		status_page.add_css_class("no-drop-highlight")
@@ -2125,7 +4005,7 @@ class PlaylistWindow(Gtk.Stack):
 		self._client.connect("disconnected", self._on_disconnected)
 
 		# packing
-		self.add_named(Gtk.ScrolledWindow(child=playlist_view, propagate_natural_height=True), "playlist")
+		self.add_named(Gtk.ScrolledWindow(child=self.playlist_view, propagate_natural_height=True), "playlist")
 		self.add_named(status_page, "empty-playlist")
 
 	def _on_drop(self, drop_target, value, x, y):
@@ -2143,6 +4023,109 @@ class PlaylistWindow(Gtk.Stack):
 	def _on_disconnected(self, *args):
 		self.set_visible_child_name("playlist")
 
+class PlaylistFinder(Gtk.SearchBar):
+	def __init__(self, client, playlist_view):
+		super().__init__()
+		self._client=client
+		self._playlist_view=playlist_view
+		self._matches=[]
+		self._current=None
+
+		# widgets
+		self.entry=Gtk.SearchEntry(placeholder_text=_("Find in playlist"), hexpand=True)
+		self._label=Gtk.Label(css_classes=["caption", "dimmed", "numeric"])
+		previous_button=Gtk.Button(icon_name="go-up-symbolic", tooltip_text=_("Previous Match"), css_classes=["flat"])
+		next_button=Gtk.Button(icon_name="go-down-symbolic", tooltip_text=_("Next Match"), css_classes=["flat"])
+
+		# connect
+		self.entry.connect("search-changed", self._on_search_changed)
+		self.entry.connect("activate", self._on_activate)
+		self.entry.connect("next-match", self._on_next_match)
+		self.entry.connect("previous-match", self._on_previous_match)
+		next_button.connect("clicked", self._on_next_match)
+		previous_button.connect("clicked", self._on_previous_match)
+		self.connect("notify::search-mode-enabled", self._on_search_mode)
+		self._client.queue.connect("changed", self._on_queue_changed)
+
+		# packing
+		box=Gtk.Box(spacing=6)
+		box.append(self.entry)
+		box.append(self._label)
+		box.append(previous_button)
+		box.append(next_button)
+		self.set_child(box)
+		self.connect_entry(self.entry)
+
+	def find(self):
+		self.set_search_mode(True)
+		self.entry.select_region(0, -1)
+		self.entry.grab_focus()
+
+	def _refresh(self):
+		if self.entry.get_text():
+			if self._current is None:
+				self._label.set_text("0/0")
+			else:
+				self._label.set_text(f"{self._current+1}/{len(self._matches)}")
+		else:
+			self._label.set_text("")
+
+	def _show(self, index):
+		if self._matches:
+			self._current=index%len(self._matches)
+			self._playlist_view.show_position(self._matches[self._current])
+		else:
+			self._current=None
+			self._playlist_view.highlight(None)
+		self._refresh()
+
+	def _on_search_changed(self, entry):
+		if (text:=self.entry.get_text()):
+			self._matches=self._client.queue.find(text)
+			# start at the current song
+			selected=self._playlist_view.get_model().get_selected()
+			self._show(0 if selected is None else bisect.bisect_left(self._matches, selected))
+		else:
+			self._matches=[]
+			self._current=None
+			self._playlist_view.highlight(None)
+			self._refresh()
+
+	def _on_activate(self, entry):
+		if self._current is not None:
+			self._client.play(self._matches[self._current])
+
+	def _on_next_match(self, *args):
+		if self._current is not None:
+			self._show(self._current+1)
+
+	def _on_previous_match(self, *args):
+		if self._current is not None:
+			self._show(self._current-1)
+
+	def _on_search_mode(self, *args):
+		if self.get_search_mode():
+			self._client.queue.index()
+		else:
+			self.entry.set_text("")
+
+	def _on_queue_changed(self, queue):
+		if self.get_search_mode():
+			queue.index()
+		if (text:=self.entry.get_text()):
+			if self._current is None:  # first matches, e.g. after the index was loaded
+				self._on_search_changed(self.entry)
+				return
+			# positions have changed, keep the index without scrolling
+			self._matches=queue.find(text)
+			if not self._matches:
+				self._current=None
+				self._playlist_view.highlight(None)
+			else:
+				self._current=min(self._current, len(self._matches)-1)
+				self._playlist_view.highlight(self._matches[self._current])
+			self._refresh()
+
 ##########
 # lyrics #
 ##########
@@ -2241,9 +4224,9 @@ class LyricsWindow(Gtk.Stack):
 class PlayButton(Gtk.Button):
 	def __init__(self, client):
 		super().__init__(icon_name="media-playback-start-symbolic", action_name="app.toggle-play", tooltip_text=_("Play"))
-		client.connect("state", self._on_state_changed)
+		client.player_state.subscribe(self, "state", self._on_state_changed)
 
-	def _on_state_changed(self, client, state):
+	def _on_state_changed(self, state):
 		if state == "play":
 			self.set_property("icon-name", "media-playback-pause-symbolic")
 			self.set_tooltip_text(_("Pause"))
@@ -2265,10 +4248,10 @@ class BitRate(Gtk.Label):
 		self._mask=_("{bitrate} kb/s")
 
 		# connect
-		client.connect("bitrate", self._on_bitrate)
+		client.player_state.subscribe(self, "bitrate", self._on_bitrate)
 		client.connect("disconnected", self._on_disconnected)
 
-	def _on_bitrate(self, client, bitrate):
+	def _on_bitrate(self, bitrate):
 		# handle unknown bitrates: https://github.com/MusicPlayerDaemon/MPD/issues/428#issuecomment-442430365
 		if bitrate is None:
 			self.set_text("")
@@ -2281,29 +4264,57 @@ class BitRate(Gtk.Label):
 class PlaylistProgress(Gtk.Label):
 	def __init__(self, client):
 		super().__init__(xalign=0, single_line_mode=True, css_classes=["caption", "dimmed"])
+		self._queue=client.queue
 		self._length=0
+		self._songpos=None
+		self._elapsed=0.0
+		self._shown=None  # values of the current text
 
 		# connect
 		client.connect("songid", self._on_songid_changed)
 		client.connect("playlist", self._on_playlist_changed)
+		client.player_state.subscribe(self, "elapsed", self._on_elapsed_changed)
+		client.player_state.animate(self, self._on_elapsed_changed)
 		client.connect("disconnected", self._on_disconnected)
+		self._queue.connect("changed", self._refresh)
 
 	def _clear(self):
 		self._length=0
+		self._songpos=None
+		self._elapsed=0.0
+		self._shown=None
 		self.set_text("")
 
-	def _refresh(self, song):
-		if song is None:
+	def _refresh(self, *args):
+		if self._songpos is None:
+			shown=None
+		else:
+			remaining=self._queue.get_remaining(self._songpos, self._elapsed)
+			shown=(self._songpos, self._length, None if remaining is None else int(remaining))
+		if shown == self._shown:  # elapsed changes on every frame, the text only shows whole seconds
+			return
+		self._shown=shown
+		if shown is None:
 			self.set_text("")
 		else:
-			self.set_text(f"{int(song)+1}/{self._length}")
+			text=f"{self._songpos+1}/{self._length}"
+			if remaining is not None:
+				text=_("{position} ({remaining} left)").format(position=text, remaining=Duration(remaining))
+			self.set_text(text)
 
 	def _on_songid_changed(self, client, song, cover, cover_path, songpos, songid, state):
-		self._refresh(songpos)
+		self._songpos=None if songpos is None else int(songpos)
+		self._elapsed=0.0
+		self._refresh()
 
 	def _on_playlist_changed(self, client, version, length, songpos):
 		self._length=length
-		self._refresh(songpos)
+		self._songpos=None if songpos is None else int(songpos)
+		self._refresh()
+
+	def _on_elapsed_changed(self, elapsed, duration):
+		self._elapsed=elapsed
+		self._refresh()
 
 	def _on_disconnected(self, *args):
 		self._clear()
@@ -2313,6 +4324,7 @@ class PlaybackControls(Gtk.Box):
 		super().__init__(hexpand=True, orientation=Gtk.Orientation.VERTICAL)
 		self._client=client
 		self._seeking=False
+		self._shown=None  # whole seconds of the labels
 
 		# labels
 		self._elapsed=Gtk.Label(xalign=0, single_line_mode=True, valign=Gtk.Align.START, css_classes=["numeric"])
@@ -2335,8 +4347,9 @@ class PlaybackControls(Gtk.Box):
 		self._adjustment.connect("notify::upper", self._on_upper)
 		key_controller.connect("key-pressed", self._on_key_pressed)
 		self._client.connect("disconnected", self._on_disconnected)
-		self._client.connect("state", self._on_state_changed)
-		self._elapsed_handler=self._client.connect("elapsed", self._on_elapsed)
+		self._client.player_state.subscribe(self, "state", self._on_state_changed)
+		self._client.player_state.subscribe(self, "elapsed", self._on_elapsed)
+		self._client.player_state.animate(self, self._on_elapsed)
 		self._client.connect("songid", self._on_songid_changed)
 
 		# packing
@@ -2370,7 +4383,7 @@ class PlaybackControls(Gtk.Box):
 			self._seeking=False
 			self._adjustment.set_value(self._scale.get_fill_level())
 
-	def _on_elapsed(self, client, elapsed, duration):
+	def _on_elapsed(self, elapsed, duration):
 		if duration > 0:
 			elapsed=min(elapsed, duration)  # fix display error
 			if not self._seeking:
@@ -2384,8 +4397,10 @@ class PlaybackControls(Gtk.Box):
 		if (duration:=self._adjustment.get_upper()) > 0:
 			self._scale.set_visible(True)
 			elapsed=self._adjustment.get_value()
-			self._elapsed.set_text(str(Duration(elapsed)))
-			self._rest.set_text(str(Duration(duration-elapsed)))
+			if (shown:=(int(elapsed), int(duration-elapsed))) != self._shown:  # the value changes on every frame
+				self._shown=shown
+				self._elapsed.set_text(str(Duration(elapsed)))
+				self._rest.set_text(str(Duration(duration-elapsed)))
 
 	def _on_change_value(self, scale, scroll, value):  # value is inaccurate (can be above upper limit)
 		if scroll == Gtk.ScrollType.JUMP:
@@ -2404,8 +4419,9 @@ class PlaybackControls(Gtk.Box):
 			self._scale.set_fill_level(0)
 			self._elapsed.set_text("")
 			self._rest.set_text("")
+			self._shown=None
 
-	def _on_state_changed(self, client, state):
+	def _on_state_changed(self, state):
 		if state == "stop":
 			self._scale.set_range(0, 0)
 
@@ -2436,7 +4452,7 @@ class VolumeControl(Gtk.Box):
 		# connect
 		scale.connect("change-value", self._on_change_value)
 		key_controller.connect("key-pressed", self._on_key_pressed)
-		self._client.connect("volume", self._refresh)
+		self._client.player_state.subscribe(self, "volume", self._refresh)
 
 		# packing
 		self.append(Gtk.Image(icon_name="audio-speakers-symbolic", accessible_role=Gtk.AccessibleRole.PRESENTATION))
@@ -2445,7 +4461,7 @@ class VolumeControl(Gtk.Box):
 	def _on_change_value(self, scale, scroll, value):
 		self._client.setvol(int(max(min(value, 100), 0)))
 
-	def _refresh(self, client, volume):
+	def _refresh(self, volume):
 		self._adjustment.set_value(max(volume, 0))
 
 	def _on_key_pressed(self, controller, keyval, keycode, state):
@@ -2484,10 +4500,10 @@ class PlayerMenu(Gtk.PopoverMenu):
 		self.set_menu_model(self._menu)
 
 		# connect
-		client.connect("volume", self._on_volume_changed)
+		client.player_state.subscribe(None, "volume", self._on_volume_changed)  # needed before the menu is mapped
 		client.connect("disconnected", self._on_disconnected)
 
-	def _on_volume_changed(self, client, volume):
+	def _on_volume_changed(self, volume):
 		if volume < 0 and self._volume_visible:
 			self._menu.remove(0)
 			self._volume_visible=False
@@ -2510,11 +4526,13 @@ class Player(Adw.Bin):
 			halign=Gtk.Align.CENTER, margin_start=12, margin_end=12, margin_bottom=6, visible=False)
 		self._lyrics_window=LyricsWindow()
 		playlist_window=PlaylistWindow(client)
+		self.finder=PlaylistFinder(client, playlist_window.playlist_view)
 		self._playback_controls=PlaybackControls(client, settings)
 		self._playback_controls.set_visible(False)
 
 		# box
 		box=Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+		box.append(self.finder)
 		box.append(Gtk.WindowHandle(child=self._cover))
 		box.append(playlist_window)
 
@@ -2534,6 +4552,9 @@ class Player(Adw.Bin):
 		header_bar=Adw.HeaderBar(show_title=False)
 		header_bar.pack_start(view_switcher)
 		header_bar.pack_end(Gtk.MenuButton(icon_name="view-more-symbolic", tooltip_text=_("Player Menu"), popover=PlayerMenu(client)))
+		find_button=Gtk.ToggleButton(icon_name="edit-find-symbolic", tooltip_text=_("Find in Playlist"))
+		find_button.bind_property("active", self.finder, "search-mode-enabled", GObject.BindingFlags.BIDIRECTIONAL)
+		header_bar.pack_end(find_button)
 
 		# connect
 		self._stack.connect("notify::visible-child-name", self._on_visible_child_name)
@@ -2549,6 +4570,10 @@ class Player(Adw.Bin):
 		toolbar_view.add_bottom_bar(self._playback_controls)
 		self.set_child(toolbar_view)
 
+	def find(self):
+		self._stack.set_visible_child_name("playlist")
+		self.finder.find()
+
 	def _on_visible_child_name(self, *args):
 		if self._stack.get_visible_child_name() == "lyrics":
 			self._lyrics_window.load()
@@ -2577,6 +4602,7 @@ class Player(Adw.Bin):
 		self._cover.set_visible(False)
 		self._lyrics_window.set_property("song", None)
 		self._stack.set_visible_child_name("playlist")
+		self.finder.set_search_mode(False)
 
 	def _on_connected(self, *args):
 		self._stack.set_visible_child_name("playlist")
@@ -2586,18 +4612,20 @@ class Player(Adw.Bin):
 ##############
 
 class ProgressBar(Gtk.ProgressBar):
-	def __init__(self, client):
+	def __init__(self, client, player_bar):
 		super().__init__(valign=Gtk.Align.START, halign=Gtk.Align.FILL)
 		self.add_css_class("osd")
-		client.connect("state", self._on_state_changed)
-		client.connect("elapsed", self._on_elapsed)
+		# the bar hides itself, updates follow the mapping of the player bar instead
+		client.player_state.subscribe(player_bar, "state", self._on_state_changed)
+		client.player_state.subscribe(player_bar, "elapsed", self._on_elapsed)
+		client.player_state.animate(player_bar, self._on_elapsed)
 
-	def _on_state_changed(self, client, state):
+	def _on_state_changed(self, state):
 		if state == "stop":
 			self.set_visible(False)
 			self.set_fraction(0.0)
 
-	def _on_elapsed(self, client, elapsed, duration):
+	def _on_elapsed(self, elapsed, duration):
 		if duration > 0:
 			self.set_visible(True)
 			self.set_fraction(elapsed/duration)
@@ -2611,7 +4639,7 @@ class PlayerBar(Gtk.Overlay):
 
 		# widgets
 		self._cover=Gtk.Picture(css_classes=["cover"], accessible_role=Gtk.AccessibleRole.PRESENTATION, visible=False)
-		progress_bar=ProgressBar(client)
+		progress_bar=ProgressBar(client, self)
 		progress_bar.update_property([Gtk.AccessibleProperty.LABEL], [_("Progress bar")])
 		self._title=Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
 		self._subtitle=Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END, css_classes=["dimmed", "caption"])
@@ -2665,12 +4693,15 @@ class MainWindow(Adw.ApplicationWindow):
 		# MPRIS
 		MPRISInterface(self, self._client, self._settings)
 
+		# time slices for main thread work are taken from the frames of the window
+		SCHEDULER.attach(self)
+
 		# widgets
 		self._browser=Browser(self._client, self._settings)
-		player=Player(self._client, self._settings)
+		self._player=Player(self._client, self._settings)
 
 		# actions
-		for name in ("close", "search", "preferences", "manual-connect", "server-info"):
+		for name in ("close", "search", "find-in-playlist", "preferences", "manual-connect", "server-info"):
 			action=Gio.SimpleAction.new(name, None)
 			action.connect("activate", getattr(self, ("_on_"+name.replace("-","_"))))
 			self.add_action(action)
@@ -2693,7 +4724,7 @@ class MainWindow(Adw.ApplicationWindow):
 		multi_layout_view.add_layout(sidebar_layout)
 		multi_layout_view.add_layout(bottom_sheet_layout)
 		multi_layout_view.set_child("browser", self._browser)
-		multi_layout_view.set_child("player", player)
+		multi_layout_view.set_child("player", self._player)
 		multi_layout_view.set_layout_name("sidebar")
 
 		# breakpoint
@@ -2732,11 +4763,15 @@ class MainWindow(Adw.ApplicationWindow):
 		# event controller
 		controller_focus=Gtk.EventControllerFocus()
 		self._browser.search_entry.add_controller(controller_focus)
+		finder_controller_focus=Gtk.EventControllerFocus()
+		self._player.finder.entry.add_controller(finder_controller_focus)
 
 		# connect
 		multi_layout_view.connect("notify::layout-name", self._on_layout_name)
 		controller_focus.connect("enter", self._on_search_entry_focus_event, True)
 		controller_focus.connect("leave", self._on_search_entry_focus_event, False)
+		finder_controller_focus.connect("enter", self._on_search_entry_focus_event, True)
+		finder_controller_focus.connect("leave", self._on_search_entry_focus_event, False)
 		self._settings.connect_after("notify::cursor-watch", self._on_cursor_watch)
 		self._client.connect("songid", self._on_songid_or_metadata_changed)
 		self._client.connect("metadata", self._on_songid_or_metadata_changed)
@@ -2760,12 +4795,26 @@ class MainWindow(Adw.ApplicationWindow):
 		if self._settings.get_boolean("maximize"):
 			self.maximize()
 		self.present()
-		# ensure window is visible
-		main=GLib.main_context_default()
-		while main.pending():
-			main.iteration()
+		# the client polls less often while the window can't be seen
+		self.get_surface().connect("notify::state", self._on_visibility_changed)
+		self.connect("map", self._on_visibility_changed)
+		self.connect("unmap", self._on_visibility_changed)
+		# connect once the window has been drawn
+		self._first_frame=self.get_frame_clock().connect("after-paint", self._on_first_frame)
+
+	def _on_first_frame(self, frame_clock):
+		frame_clock.disconnect(self._first_frame)
+		SCHEDULER.add(self._connect, priority=GLib.PRIORITY_DEFAULT)
+
+	def _connect(self):
 		self._settings.bind("maximize", self, "maximized", Gio.SettingsBindFlags.SET)
 		self._client.open_connection(self._settings.get_boolean("manual-connection"))
+		return False
+
+	def _on_visibility_changed(self, *args):
+		hidden=Gdk.ToplevelState.MINIMIZED|Gdk.ToplevelState.SUSPENDED
+		surface=self.get_surface()
+		self._client.set_window_visible(self.get_mapped() and surface is not None and not surface.get_state() & hidden)
 
 	def _clear_title(self):
 		self.set_title("Plattenalbum")
@@ -2785,6 +4834,10 @@ class MainWindow(Adw.ApplicationWindow):
 	def _on_search(self, action, param):
 		self._browser.search()
 
+	def _on_find_in_playlist(self, action, param):
+		self._bottom_sheet.set_open(True)
+		self._player.find()
+
 	def _on_preferences(self, action, param):
 		if self.get_visible_dialog() is None:
 			PreferencesDialog(self._settings).present(self)
@@ -2913,7 +4966,7 @@ class Plattenalbum(Adw.Application):
 
 		# accelerators
 		action_accels=(
-			("app.quit", ["<Ctrl>q"]),("win.close", ["<Ctrl>w"]),("win.preferences", ["<Ctrl>comma"]),("win.search", ["<Ctrl>f"]),
+			("app.quit", ["<Ctrl>q"]),("win.close", ["<Ctrl>w"]),("win.preferences", ["<Ctrl>comma"]),("win.search", ["<Ctrl>f"]),("win.find-in-playlist", ["<Shift><Ctrl>f"]),
 			("win.server-info", ["<Ctrl>i"]),("app.disconnect", ["<Ctrl>d"]),("app.update", ["F5"]),("app.clear", ["<Shift>Delete"]),
 			("app.toggle-play", ["space"]),("app.stop", ["<Ctrl>space"]),("app.next", ["<Ctrl>k"]),("app.previous", ["<Shift><Ctrl>k"]),
 			("app.repeat", ["<Ctrl>r"]),("app.random", ["<Ctrl>h"]),("app.single::1", ["<Ctrl>s"]),("app.single::0", ["<Shift><Ctrl>s"]),